@@ -0,0 +1,132 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""Cython builds of the interpolation search kernel and the ArraySearcher.search() loop.
+
+Build in place with: python setup.py build_ext --inplace
+"""
+from libc.stdint cimport int16_t, int32_t, int64_t
+
+
+cdef Py_ssize_t _interp_search(const int64_t* array, Py_ssize_t n, int64_t key) noexcept nogil:
+    """Index of key in the sorted array, or -1. Runs without the GIL."""
+    cdef Py_ssize_t idx_bottom = 0
+    cdef Py_ssize_t idx_top = n - 1
+    cdef Py_ssize_t idx_guess, span
+    cdef int64_t val_bottom, val_top, val_guess, denom
+    cdef double float_denom
+    if n == 0:
+        return -1
+    val_bottom = array[idx_bottom]
+    val_top = array[idx_top]
+    while True:
+        if key < val_bottom or key > val_top:
+            return -1
+        span = idx_top - idx_bottom
+        float_denom = <double>val_top - <double>val_bottom
+        if span < 32:  # _BINARY_TAIL
+            # Halving a short range is cheaper than the interpolation divide
+            idx_guess = idx_bottom + span // 2
+        elif span * float_denom < 4611686018427387904.0:  # 2**62, as _EXACT_PRODUCT_LIMIT
+            # Equal bound values mean key == val_bottom, so the guess lands on idx_bottom without a branch
+            denom = val_top - val_bottom
+            idx_guess = idx_bottom + (span * (key - val_bottom)) // (denom | (denom == 0))
+        else:
+            # The exact product could overflow int64, so interpolate in doubles
+            idx_guess = idx_bottom + <Py_ssize_t>(span * ((<double>key - <double>val_bottom) / float_denom))
+        val_guess = array[idx_guess]
+        if val_guess == key:
+            return idx_guess
+        elif val_guess < key:
+            idx_bottom = idx_guess + 1
+            val_bottom = array[idx_bottom]
+        else:
+            idx_top = idx_guess - 1
+            val_top = array[idx_top]
+
+
+def interp_search(const int64_t[::1] array, int64_t key):
+    """Find the position of key in a sorted contiguous int64 array.
+
+    Args:
+        array (np.ndarray): A sorted, contiguous int64 array.
+        key (int): The value to find.
+
+    Returns:
+        int: The index of key in the array, or -1 if it is not present.
+    """
+    cdef Py_ssize_t idx
+    if array.shape[0] == 0:
+        return -1
+    with nogil:
+        idx = _interp_search(&array[0], array.shape[0], key)
+    return idx
+
+
+ctypedef fused array_int_t:
+    int16_t
+    int32_t
+    int64_t
+
+
+cdef Py_ssize_t _search_core(const array_int_t* array, int64_t query_val, double interpolation_threshold,
+                             int strategy, Py_ssize_t max_interp_steps, Py_ssize_t idx_bottom, Py_ssize_t idx_top,
+                             Py_ssize_t* interpolation_count, Py_ssize_t* binary_count) noexcept nogil:
+    """The ArraySearcher.search() loop. Returns the index of query_val or -1, and fills in the step counts."""
+    cdef int64_t val_bottom = array[idx_bottom]
+    cdef int64_t val_top = array[idx_top]
+    cdef int64_t val_guess
+    cdef Py_ssize_t idx_guess, old_span, span
+    cdef double float_denom
+    cdef bint binary_mode = strategy == 2
+    cdef bint poor_step
+    interpolation_count[0] = 0
+    binary_count[0] = 0
+    while True:
+        if query_val < val_bottom or query_val > val_top:
+            return -1
+        if val_top == val_bottom:
+            return idx_bottom
+
+        if binary_mode:
+            binary_count[0] += 1
+            idx_guess = idx_bottom + (idx_top - idx_bottom) // 2
+        else:
+            interpolation_count[0] += 1
+            span = idx_top - idx_bottom
+            float_denom = <double>val_top - <double>val_bottom
+            if span * float_denom < 4611686018427387904.0:  # 2**62, as _EXACT_PRODUCT_LIMIT
+                idx_guess = idx_bottom + (span * (query_val - val_bottom)) // (val_top - val_bottom)
+            else:
+                # The exact product could overflow int64, so interpolate in doubles
+                idx_guess = idx_bottom + <Py_ssize_t>(span * ((<double>query_val - <double>val_bottom) / float_denom))
+        val_guess = array[idx_guess]
+        if val_guess == query_val:
+            return idx_guess
+
+        old_span = idx_top - idx_bottom + 1
+        if val_guess < query_val:
+            idx_bottom = idx_guess + 1
+            val_bottom = array[idx_bottom]
+        else:
+            idx_top = idx_guess - 1
+            val_top = array[idx_top]
+
+        if strategy == 0:
+            # The same rules as ArraySearcher._set_search_mode()
+            poor_step = <double>(old_span - (idx_top - idx_bottom + 1)) / old_span < interpolation_threshold
+            binary_mode = interpolation_count[0] >= max_interp_steps or (not binary_mode and poor_step)
+
+
+def search_core(const array_int_t[::1] array, int64_t query_val, double interpolation_threshold, int strategy,
+                Py_ssize_t max_interp_steps, Py_ssize_t idx_bottom, Py_ssize_t idx_top):
+    """Cython build of the compiled ArraySearcher.search() loop, with the same arguments and results as
+    interpolation_search._search_core.
+
+    Returns:
+        tuple[int]: The index of query_val (-1 if it is not in the array), and the total, interpolation and
+                    binary step counts.
+    """
+    cdef Py_ssize_t idx, interpolation_count, binary_count
+    with nogil:
+        idx = _search_core(&array[0], query_val, interpolation_threshold, strategy, max_interp_steps,
+                           idx_bottom, idx_top, &interpolation_count, &binary_count)
+    return idx, interpolation_count + binary_count, interpolation_count, binary_count
@@ -0,0 +1,229 @@
+"""Benchmarks of the ArraySearcher search strategies on random progressions, and plots of their results.
+
+Run the full set of tests with: python benchmarks.py
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+import os
+from statistics import NormalDist
+
+from matplotlib import pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from tqdm import tqdm
+
+from interpolation_search import (ArraySearcher, _generate_progressions, _interp_step_cap, _lockstep_search,
+                                  generate_random_array)
+
+
+# Strategies compared by run_cardinality_tests, and the most repeats of one cardinality run as a single task
+_TEST_STRATEGIES = ['interpolation', 'mixed', 'binary']
+_TEST_CHUNK = 250
+
+
+def _cardinality_test_counts(cardinality, repeats, space, rng):
+    """Runs one block of run_cardinality_tests() repeats at a single cardinality.
+
+    Returns:
+        np.ndarray: The search step counts, with one row per strategy in _TEST_STRATEGIES and one column per repeat.
+    """
+    # Generate all of the repeats together, one progression per row, and search them together
+    arrays = _generate_progressions(repeats, cardinality, space=space, rng=rng)
+    query_idx = rng.integers(cardinality, size=repeats)
+    rows = np.arange(repeats)
+    query_vals = arrays[rows, query_idx]
+    return np.array([_lockstep_search(arrays, rows, query_vals, 0.25, strategy, _interp_step_cap(cardinality))[1]
+                     for strategy in _TEST_STRATEGIES])
+
+
+def run_cardinality_tests(space='arithmetic', repeats=1000, top_power=10, rng=None, workers=1):
+    """Runs repeated tests on a series of doubling cardinality values.
+    
+    A new progression is generated for each repeat, and all 3 splitting methods are compared.
+    The repeats are run in blocks of up to _TEST_CHUNK, each drawing from its own child generator of rng, so the
+    results are the same however many workers run them.
+
+    Args:
+        space (str, optional): Whether to test 'arithmetic' or 'geometric' progressions.
+                               Defaults to 'arithmetic'.
+        repeats (int, optional): Number of repeats. Defaults to 1000.
+        top_power (int, optional): Final value to use for the doubling progression (2**top_power).
+        rng (np.random.Generator, optional): The random generator shared by all of the tests. If None, a new
+                                             default generator is used. Defaults to None.
+        workers (int or None, optional): Number of processes to run the blocks on. None uses one per CPU, and 1
+                                         runs them in this process. Defaults to 1.
+
+    Returns:
+        pd.DataFrame: The results in tall form - one row per test and method, with 'cardinality', 'method' and
+                      'iterations' columns.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    blocks = [(cardinality, min(_TEST_CHUNK, repeats - start))
+              for cardinality in [2**n for n in range(top_power + 1)]
+              for start in range(0, repeats, _TEST_CHUNK)]
+    block_cardinalities = [cardinality for cardinality, _ in blocks]
+    block_repeats = [block_size for _, block_size in blocks]
+    block_rngs = rng.spawn(len(blocks))
+
+    # One preallocated column per field, filled a block of repeats at a time
+    n_rows = (top_power + 1) * len(_TEST_STRATEGIES) * repeats
+    cardinalities = np.empty(n_rows, dtype=np.int64)
+    methods = np.empty(n_rows, dtype=object)
+    iterations = np.empty(n_rows, dtype=np.int64)
+    row = 0
+    with ProcessPoolExecutor(workers) if workers != 1 else nullcontext() as executor:
+        run = executor.map if executor is not None else map
+        block_counts = run(_cardinality_test_counts, block_cardinalities, block_repeats, repeat(space), block_rngs)
+        for (cardinality, block_size), counts in tqdm(zip(blocks, block_counts), total=len(blocks)):
+            for strategy, strategy_counts in zip(_TEST_STRATEGIES, counts):
+                rows_slice = slice(row, row + block_size)
+                cardinalities[rows_slice] = cardinality
+                methods[rows_slice] = strategy
+                iterations[rows_slice] = strategy_counts
+                row += block_size
+
+    # Built straight from the columns, so the plots don't need to unpivot a wide table
+    return pd.DataFrame({'cardinality': cardinalities, 'method': methods, 'iterations': iterations})
+
+
+def plot_cardinality_tests(results, title=None, figsize=(12, 9), facecolor='white', confidence_interval=95):
+    """Generate a plot of the mean iterations of each method against cardinality.
+
+    The intervals are computed in closed form from each group's mean and standard deviation (normal
+    approximation), rather than by bootstrapping every group.
+
+    Args:
+        results (pd.DataFrame): Tall results, as returned by run_cardinality_tests().
+        title (str, optional): The plot title. Defaults to None.
+        figsize (tuple, optional): The figure dimensions in inches. Defaults to (12, 9).
+        facecolor (str, optional): The figure background colour. Defaults to 'white'.
+        confidence_interval (int or str, optional): Confidence interval percent value to use in the plot.
+                                                    Alternatively, if 'sd' the standard deviation will be shown.
+                                                    Defaults to 95.
+
+    Returns:
+        matplotlib.figure.Figure: The figure.
+    """
+    tall_df = pd.DataFrame(results)
+    # Summarise each method/cardinality group once
+    summary_df = (tall_df.groupby(['method', 'cardinality'], sort=False)['iterations']
+                  .agg(['mean', 'std', 'count']).reset_index().sort_values('cardinality', kind='stable'))
+    if confidence_interval == 'sd':
+        half_width = summary_df['std']
+    else:
+        z = NormalDist().inv_cdf(0.5 + confidence_interval / 200)
+        half_width = z * summary_df['std'] / np.sqrt(summary_df['count'])
+    # A group with a single repeat has no spread
+    summary_df['half_width'] = half_width.fillna(0)
+    # Make the plot
+    fig, ax = plt.subplots(figsize=figsize, facecolor=facecolor)
+    for method, method_df in summary_df.groupby('method', sort=False):
+        line, = ax.plot(method_df['cardinality'], method_df['mean'], label=method)
+        ax.fill_between(method_df['cardinality'], method_df['mean'] - method_df['half_width'],
+                        method_df['mean'] + method_df['half_width'], color=line.get_color(), alpha=0.2, linewidth=0)
+    ax.legend(title='method')
+    ax.set_xlabel('progression cardinality')
+    ax.set_xscale('log', base=2)
+    ax.set_ylabel('mean number of iterations')
+    # Title
+    if title:
+        # Get repeats (just check the value for the first method/cardinality group)
+        repeats = summary_df['count'].iloc[0]
+        # Underscore assignment to supress Text object output
+        _ = ax.set_title(f'{title} ({repeats} repeats)')
+    return fig
+
+
+def plot_progression_comparison(arithmetic_results, geometric_results, cardinality, title=None, figsize=(12, 9),
+                                facecolor='white', n_boot=200):
+    # Keep the requested cardinality from each space's tall results before labelling and joining them, so only
+    # those rows are ever copied
+    space_dfs = []
+    for space, results in (('arithmetic', arithmetic_results), ('geometric', geometric_results)):
+        results_df = pd.DataFrame(results)
+        space_dfs.append(results_df[results_df['cardinality'] == cardinality].assign(space=space))
+    tall_df = pd.concat(space_dfs, ignore_index=True)
+    # Make the plot
+    fig, ax = plt.subplots(figsize=figsize, facecolor=facecolor)
+    ax = sns.barplot(data=tall_df, x='space', y='iterations', hue='method', n_boot=n_boot)
+    ax.set_xlabel('array space')
+    ax.set_yscale('log', base=10)
+    ax.set_ylabel('log(mean number of iterations)')
+    # Title
+    if title:
+        # Underscore assignment to supress Text object output
+        _ = ax.set_title(f'{title} (cardinality {cardinality})')
+    return fig
+
+def main():
+    # SETUP
+    # Pandas and seaborn options
+    pd.set_option('display.max_rows', 10)
+    sns.set_context('talk') 
+    # Make sure we have a folder to write results to
+    if not os.path.isdir('results'):
+        os.mkdir('results')
+    # One random generator shared by everything below
+    rng = np.random.default_rng()
+
+
+    # WALKTHROUGH EXAMPLE
+    # Input parameters
+    CARDINALITY = 50
+    SPACE = 'arithmetic'
+    START_RANGE = (1, 10000)
+    STEP_RANGE = (1, 10000)
+    # Generate a random progression
+    array = generate_random_array(cardinality=CARDINALITY, space=SPACE, start_range=START_RANGE, step_range=STEP_RANGE,
+                                  rng=rng)
+    print(array)
+    # Make a searcher object
+    searcher = ArraySearcher(array)
+    query_val = searcher.get_random_array_item(rng=rng)
+    print(query_val)
+    # Compare the different search methods
+    results = searcher.compare_methods(query_val, verbose=True)
+    print(results)
+
+
+    # ARITHMETIC SERIS TESTS
+    # Run tests for arithmetic series of cardinalities 2**0 - 2**10 (1000 repeats)
+    REPEATS = 1000
+    SPACE = 'arithmetic'
+    TOP_POWER = 10
+    arithmetic_results = run_cardinality_tests(space=SPACE, repeats=REPEATS, top_power=TOP_POWER, rng=rng,
+                                               workers=None)
+    # Export results as CSV
+    arithmetic_results.to_csv('results/arithmetic_results.csv')
+    # Make seaborn plot
+    fig = plot_cardinality_tests(arithmetic_results, title='Arithmetic comparison')
+    fig.savefig('results/arithmetic_comparison.png')
+
+
+    # GEOMETRIC SERIS TESTS
+    # Run tests for geometric series of cardinalities 2**0 - 2**10 (1000 repeats)
+    SPACE = 'geometric'
+    geometric_results = run_cardinality_tests(space=SPACE, repeats=REPEATS, top_power=TOP_POWER, rng=rng,
+                                              workers=None)
+    # Export results as CSV
+    geometric_results.to_csv('results/geometric_results.csv')
+    # Make seaborn plot
+    fig = plot_cardinality_tests(geometric_results, title='Arithmetic comparison')
+    fig.savefig('results/geometric_comparison.png')
+
+
+    # COMPARE ARITHMETIC AND GEOMETRIC PERFORMANCE
+    # Input parameters
+    CARDINALITY = 1024
+    # Make seaborn plot
+    fig = plot_progression_comparison(arithmetic_results=arithmetic_results,
+                                      geometric_results=geometric_results,
+                                      cardinality=CARDINALITY,
+                                      title='Comparison of arithmetic vs geometric progressions')
+    fig.savefig('results/progression_space_comparison.png')
+
+if __name__ == '__main__':
+    main()
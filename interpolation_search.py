@@ -1,9 +1,700 @@
-import random
+import functools
+import math
+import operator
 
-from matplotlib import pyplot as plt
-import pandas as pd
-import seaborn as sns
-from tqdm import tqdm
+from numba import njit, prange
+import numpy as np
+
+try:
+    from _search import interp_search as _cython_interp_search, search_core as _cython_search_core
+except ImportError:
+    # The optional Cython kernels haven't been built (see setup.py) - the Numba kernels are used instead
+    _cython_interp_search = None
+    _cython_search_core = None
+
+
+# Array dtypes used for storage, narrowest first. The compiled kernels are specialised for each of them.
+_INT_DTYPES = (np.int16, np.int32, np.int64)
+_KERNEL_SIGNATURES = [f'int64({np.dtype(dtype).name}[:], int64)' for dtype in _INT_DTYPES]
+
+
+def _narrowest_int_dtype(array):
+    """Returns the narrowest storage dtype that can hold every value of an int64 array."""
+    min_val, max_val = array.min(), array.max()
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= min_val and max_val <= info.max:
+            return dtype
+
+
+def _exact_int(value):
+    """Returns value as a Python int, accepting floats with integral values.
+
+    Raises:
+        TypeError: If value isn't an integer.
+    """
+    try:
+        return operator.index(value)
+    except TypeError:
+        if isinstance(value, (float, np.floating)) and float(value).is_integer():
+            return int(value)
+        raise TypeError(f'Values must be integers, not {value!r}.') from None
+
+
+def _int_values(array):
+    """Returns the values of array as a NumPy integer array - unchanged if it already has one of the kernel dtypes,
+    otherwise int64, or an object array of Python ints if any value is beyond the int64 range.
+
+    Values are never silently wrapped or truncated.
+
+    Raises:
+        TypeError: If any value isn't an integer.
+    """
+    if isinstance(array, np.ndarray) and array.dtype in _INT_DTYPES:
+        return array
+    values = np.asarray(array)
+    if values.dtype.kind in 'biu':
+        # Unsigned values above the int64 range would wrap in astype
+        if values.dtype.kind == 'u' and values.size and values.max() > np.iinfo(np.int64).max:
+            return values.astype(object)
+        return values.astype(np.int64)
+    if values.dtype.kind == 'f' and isinstance(array, np.ndarray):
+        if not (np.isfinite(values).all() and (values == np.floor(values)).all()):
+            raise TypeError('Values must be integers.')
+        if values.size and (values.min() < -2.0**63 or values.max() >= 2.0**63):
+            return np.array([int(val) for val in values], dtype=object)
+        return values.astype(np.int64)
+    # Object arrays and other sequences are checked value by value. NumPy reads a list that mixes negative values
+    # with ints beyond int64 as float64, so the original values are used rather than the converted ones.
+    ints = [_exact_int(val) for val in array]
+    try:
+        return np.array(ints, dtype=np.int64)
+    except OverflowError:
+        return np.array(ints, dtype=object)
+
+
+def _as_kernel_array(array):
+    """Returns array as a contiguous array of one of the kernel dtypes.
+
+    Raises:
+        OverflowError: If any value is beyond the int64 range.
+    """
+    array = _int_values(array)
+    if array.dtype == object:
+        raise OverflowError('The array has values beyond the int64 range - search it with an ArraySearcher.')
+    return np.ascontiguousarray(array)
+
+
+# Interpolation guesses whose index span times value span is below this are computed exactly in int64.
+# It is well under 2**63, so the float estimate of the product can't misjudge an overflow.
+_EXACT_PRODUCT_LIMIT = 2.0**62
+
+
+# Ranges shorter than this are finished with binary steps by the standalone interpolation search kernels
+_BINARY_TAIL = 32
+
+
+@njit(_KERNEL_SIGNATURES, cache=True, boundscheck=False)
+def _interpolation_search_kernel(array, key):
+    """Compiled interpolation search. Returns the index of key in the sorted array, or -1."""
+    idx_bottom = 0
+    idx_top = array.shape[0] - 1
+    if idx_top < 0:
+        return -1
+    val_bottom = array[idx_bottom]
+    val_top = array[idx_top]
+    # Each guess stays within [idx_bottom, idx_top] and each move keeps idx_bottom <= idx_top,
+    # so the only exits are a miss outside the bound values or a hit
+    while True:
+        if key < val_bottom or key > val_top:
+            return -1
+        span = idx_top - idx_bottom
+        float_denom = float(val_top) - float(val_bottom)
+        if span < _BINARY_TAIL:
+            # Halving a short range is cheaper than the interpolation divide, and interpolation gains little there
+            idx_guess = idx_bottom + span // 2
+        elif span * float_denom < _EXACT_PRODUCT_LIMIT:
+            # Equal bound values mean key == val_bottom, so the numerator is 0 and the guess lands on idx_bottom.
+            # OR-ing in (denom == 0) keeps that division legal without a branch in front of it.
+            denom = val_top - val_bottom
+            idx_guess = idx_bottom + (span * (key - val_bottom)) // (denom | (denom == 0))
+        else:
+            # The exact product (or the value differences) could overflow int64, so interpolate in floats.
+            # The fraction can't exceed 1, so the guess still can't leave [idx_bottom, idx_top].
+            idx_guess = idx_bottom + int(span * ((float(key) - float(val_bottom)) / float_denom))
+        val_guess = array[idx_guess]
+        if val_guess == key:
+            return idx_guess
+        elif val_guess < key:
+            idx_bottom = idx_guess + 1
+            val_bottom = array[idx_bottom]
+        else:
+            idx_top = idx_guess - 1
+            val_top = array[idx_top]
+
+
+@functools.lru_cache(maxsize=None)
+def _make_kernel(dtype):
+    """Returns an interpolation search function specialised for contiguous arrays of dtype.
+
+    Each dtype is compiled once per process. Object arrays (values beyond int64) get the plain Python
+    interpolation-only search loop, which interpolates exactly in Python ints - their values may be too large
+    to convert to floats.
+    """
+    if dtype == object:
+        def exact_interpolation_search(array, key):
+            return _search_loop.py_func(array, key, 0.0, _STRATEGY_CODES['interpolation'], 0, 0, len(array) - 1,
+                                        python_ints=True)[0]
+        return exact_interpolation_search
+    return njit(f'int64({dtype.name}[::1], int64)', cache=True, boundscheck=False)(_interpolation_search_kernel.py_func)
+
+
+# Below this many elements the N-ary search in _binary_search_kernel hands over to a plain binary search
+_NARY_THRESHOLD = 128
+
+
+@njit(_KERNEL_SIGNATURES, cache=True, boundscheck=False)
+def _binary_search_kernel(array, key):
+    """Compiled binary search. Returns the index of key in the sorted array, or -1.
+
+    Large ranges are narrowed 8 ways per step by comparing the key with 7 evenly spaced pivots,
+    then the remainder is finished with a plain binary search for the first value not less than key.
+    """
+    idx_bottom = 0
+    idx_top = array.shape[0]
+    while idx_top - idx_bottom >= _NARY_THRESHOLD:
+        step = (idx_top - idx_bottom) // 8
+        # The pivots below the key form a prefix, so counting them picks one of the 8 sub-ranges
+        n_less = 0
+        for i in range(1, 8):
+            n_less += array[idx_bottom + i * step] < key
+        if n_less < 7:
+            idx_top = idx_bottom + (n_less + 1) * step
+        if n_less > 0:
+            idx_bottom += n_less * step + 1
+    while idx_bottom < idx_top:
+        idx_guess = idx_bottom + (idx_top - idx_bottom) // 2
+        if array[idx_guess] < key:
+            idx_bottom = idx_guess + 1
+        else:
+            idx_top = idx_guess
+    if idx_bottom < array.shape[0] and array[idx_bottom] == key:
+        return idx_bottom
+    return -1
+
+
+@njit(cache=True)
+def _sorted_keys_search_kernel(array, keys):
+    """Lower-bound positions of ascending keys, each search starting where the previous one stopped."""
+    n = array.shape[0]
+    out = np.empty(keys.shape[0], dtype=np.int64)
+    left_bound = 0
+    for i in range(keys.shape[0]):
+        key = keys[i]
+        # Gallop forward from the previous position until the key is bracketed
+        idx_bottom = left_bound
+        idx_top = left_bound
+        step = 1
+        while idx_top < n and array[idx_top] < key:
+            idx_bottom = idx_top + 1
+            idx_top = left_bound + step
+            step *= 2
+        idx_top = min(idx_top, n)
+        # Binary search the bracket for the first value not less than the key
+        while idx_bottom < idx_top:
+            idx_guess = idx_bottom + (idx_top - idx_bottom) // 2
+            if array[idx_guess] < key:
+                idx_bottom = idx_guess + 1
+            else:
+                idx_top = idx_guess
+        out[i] = idx_bottom
+        left_bound = idx_bottom
+    return out
+
+
+@njit(cache=True)
+def _build_eytzinger(array):
+    """Lays a sorted array out in Eytzinger (breadth-first) order with the root at index 1.
+
+    Returns the reordered values and, for each slot, the matching index in the sorted array.
+    Slot 0 is unused by the tree and maps to len(array), meaning 'greater than every value'.
+    """
+    n = array.shape[0]
+    eytzinger = np.empty(n + 1, dtype=array.dtype)
+    eytzinger_idx = np.empty(n + 1, dtype=np.int64)
+    eytzinger_idx[0] = n
+    # An in-order walk of the implicit tree visits the slots in sorted order
+    i = 1
+    while 2 * i <= n:
+        i *= 2
+    for k in range(n):
+        eytzinger[i] = array[k]
+        eytzinger_idx[i] = k
+        if 2 * i + 1 <= n:
+            # Successor is the leftmost node of the right subtree
+            i = 2 * i + 1
+            while 2 * i <= n:
+                i *= 2
+        else:
+            # Successor is the first ancestor we reach from its left subtree
+            while i & 1:
+                i >>= 1
+            i >>= 1
+    return eytzinger, eytzinger_idx
+
+
+@njit(cache=True)
+def _eytzinger_search_kernel(eytzinger, eytzinger_idx, keys):
+    """Lower-bound positions (in the sorted array) of keys, found by a branchless Eytzinger descent."""
+    n = eytzinger.shape[0] - 1
+    out = np.empty(keys.shape[0], dtype=np.int64)
+    for j in range(keys.shape[0]):
+        key = keys[j]
+        i = 1
+        while i <= n:
+            i = 2 * i + (eytzinger[i] < key)
+        # Undo the trailing right turns and the last left turn to get back to the lower bound
+        while i & 1:
+            i >>= 1
+        i >>= 1
+        out[j] = eytzinger_idx[i]
+    return out
+
+
+def _veb_depth_tables(height):
+    """Per-depth navigation tables for a van Emde Boas layout of a perfect binary tree.
+
+    The layout recursively splits a tree into a top tree and the bottom trees hanging off it, storing each
+    piece contiguously. For a node at depth d > 0, the split between depths d - 1 and d happens inside a
+    subtree whose root is at depth top_depth[d], with a top tree of top_size[d] nodes followed by bottom
+    trees of bottom_size[d] nodes each.
+
+    Args:
+        height (int): The number of levels in the tree.
+
+    Returns:
+        tuple[np.ndarray]: The top_depth, top_size and bottom_size tables, indexed by depth.
+    """
+    top_depth = np.zeros(height, dtype=np.int64)
+    top_size = np.zeros(height, dtype=np.int64)
+    bottom_size = np.zeros(height, dtype=np.int64)
+
+    def split(root_depth, subtree_height):
+        if subtree_height <= 1:
+            return
+        # The bottom trees get the largest power of two number of levels below the subtree height
+        bottom_height = 1 << ((subtree_height - 1).bit_length() - 1)
+        top_height = subtree_height - bottom_height
+        depth = root_depth + top_height
+        top_depth[depth] = root_depth
+        top_size[depth] = (1 << top_height) - 1
+        bottom_size[depth] = (1 << bottom_height) - 1
+        split(root_depth, top_height)
+        split(depth, bottom_height)
+
+    split(0, height)
+    return top_depth, top_size, bottom_size
+
+
+@njit(cache=True)
+def _veb_pos(pos, top_depth, top_size, bottom_size, i, depth):
+    """Position in a van Emde Boas layout of node i (1-based breadth-first index) at depth > 0, given the
+    positions of the nodes above it on its path in pos."""
+    # Offset of this node's bottom tree within the block that starts at its top tree's root
+    mask = top_size[depth]
+    return pos[top_depth[depth]] + mask + (i & mask) * bottom_size[depth]
+
+
+@njit(cache=True)
+def _build_veb(array, top_depth, top_size, bottom_size):
+    """Lays a sorted array out in van Emde Boas order, as the in-order contents of a perfect binary tree.
+
+    Slots beyond the end of the array are padded with its last value, which never becomes a lower bound
+    ahead of the real element. The tree has 2**height - 1 slots, fewer than twice the array length, in the
+    array's dtype - the sorted index of each slot follows from its tree position, so it isn't stored.
+    """
+    n = array.shape[0]
+    height = top_depth.shape[0]
+    size = (1 << height) - 1
+    veb = np.empty(size, dtype=array.dtype)
+    # Layout positions of the nodes on the path from the root to the current node, by depth
+    pos = np.zeros(height, dtype=np.int64)
+    # An in-order walk of the breadth-first indices visits the nodes in sorted order
+    i = 1
+    depth = 0
+    while 2 * i <= size:
+        i *= 2
+        depth += 1
+        pos[depth] = _veb_pos(pos, top_depth, top_size, bottom_size, i, depth)
+    for k in range(size):
+        veb[pos[depth]] = array[min(k, n - 1)]
+        if 2 * i + 1 <= size:
+            i = 2 * i + 1
+            depth += 1
+            pos[depth] = _veb_pos(pos, top_depth, top_size, bottom_size, i, depth)
+            while 2 * i <= size:
+                i *= 2
+                depth += 1
+                pos[depth] = _veb_pos(pos, top_depth, top_size, bottom_size, i, depth)
+        else:
+            while i & 1:
+                i >>= 1
+                depth -= 1
+            i >>= 1
+            depth -= 1
+    return veb
+
+
+@njit(cache=True)
+def _veb_search_kernel(veb, top_depth, top_size, bottom_size, n, keys):
+    """Lower-bound positions (in the sorted array of length n) of keys, found by a van Emde Boas descent."""
+    height = top_depth.shape[0]
+    pos = np.zeros(height, dtype=np.int64)
+    out = np.empty(keys.shape[0], dtype=np.int64)
+    for j in range(keys.shape[0]):
+        key = keys[j]
+        best = n
+        i = 1
+        for depth in range(height):
+            if depth > 0:
+                pos[depth] = _veb_pos(pos, top_depth, top_size, bottom_size, i, depth)
+            go_right = veb[pos[depth]] < key
+            if not go_right:
+                # The in-order rank of node i, clamped to the last real element for the padding slots
+                best = min((2 * (i - (1 << depth)) + 1) * (1 << (height - 1 - depth)) - 1, n - 1)
+            i = 2 * i + go_right
+        out[j] = best
+    return out
+
+
+# Keys handled per parallel task - a whole number of 64 byte cache lines of int64 results,
+# so threads don't write to the same line of the output array
+_PARALLEL_CHUNK = 64
+
+
+@njit(parallel=True, cache=True)
+def _search_many_parallel(array, keys, out):
+    """Fills out with the index of each key (or -1), interpolation searching chunks of keys on separate threads."""
+    n_chunks = (keys.shape[0] + _PARALLEL_CHUNK - 1) // _PARALLEL_CHUNK
+    for chunk in prange(n_chunks):
+        for i in range(chunk * _PARALLEL_CHUNK, min((chunk + 1) * _PARALLEL_CHUNK, keys.shape[0])):
+            out[i] = _interpolation_search_kernel(array, keys[i])
+
+
+def interpolation_search(array, key):
+    """Find the position of key in a sorted integer array with a compiled interpolation search.
+
+    Args:
+        array (list or np.ndarray): A sorted sequence of integers.
+        key (int): The value to find.
+
+    Returns:
+        int: The index of key in the array, or -1 if it is not present.
+    """
+    array = _as_kernel_array(array)
+    if _cython_interp_search is not None and array.dtype == np.int64:
+        return _cython_interp_search(array, key)
+    return _interpolation_search_kernel(array, key)
+
+
+def binary_search(array, key):
+    """Find the position of key in a sorted integer array with a compiled binary search.
+
+    Args:
+        array (list or np.ndarray): A sorted sequence of integers.
+        key (int): The value to find.
+
+    Returns:
+        int: The index of key in the array, or -1 if it is not present.
+    """
+    return _binary_search_kernel(_as_kernel_array(array), key)
+
+
+def _lockstep_search(arrays, rows, query_vals, interpolation_threshold, search_strategy, max_interp_steps):
+    """Runs the ArraySearcher.search() strategies on a batch of queries, one step of every query per pass.
+
+    Each pass is a handful of NumPy operations over the unfinished queries, so the interpreter overhead is
+    paid per step rather than per query and step. Queries that are not in their array give -1.
+
+    Args:
+        arrays (np.ndarray): A 2-D array with one sorted array per row.
+        rows (np.ndarray): The row of arrays searched by each query.
+        query_vals (np.ndarray): The values to find.
+        interpolation_threshold (float): As for ArraySearcher.search().
+        search_strategy (str): As for ArraySearcher.search().
+        max_interp_steps (int): The number of interpolation steps a mixed search may take.
+
+    Returns:
+        tuple[np.ndarray]: The index found for each query, and its total, interpolation and binary step counts.
+    """
+    n_queries = len(query_vals)
+    last = arrays.shape[1] - 1
+    found_idx = np.full(n_queries, -1, dtype=np.int64)
+    interpolation_counts = np.zeros(n_queries, dtype=np.int64)
+    binary_counts = np.zeros(n_queries, dtype=np.int64)
+
+    # State of the unfinished queries - compacted every pass so that finished queries cost nothing
+    ids = np.arange(n_queries)
+    rows = np.asarray(rows)
+    # The interpolation arithmetic is done in int64 (or Python ints for object arrays), as narrow storage dtypes
+    # would wrap in the value differences and the product
+    wide_dtype = np.int64 if arrays.dtype != object else object
+    query_vals = np.asarray(query_vals).astype(wide_dtype, copy=False)
+    idx_bottom = np.zeros(n_queries, dtype=np.int64)
+    idx_top = np.full(n_queries, last, dtype=np.int64)
+    binary_mode = np.full(n_queries, search_strategy == 'binary')
+
+    while len(ids):
+        val_bottom = arrays[rows, np.minimum(idx_bottom, last)].astype(wide_dtype, copy=False)
+        val_top = arrays[rows, np.maximum(idx_top, 0)].astype(wide_dtype, copy=False)
+        # Queries outside their bound values are missing, and equal bound values mean the query is at idx_bottom
+        missing = (idx_bottom > idx_top) | (query_vals < val_bottom) | (query_vals > val_top)
+        flat = ~missing & (val_bottom == val_top)
+        found_idx[ids[flat]] = idx_bottom[flat]
+        keep = ~(missing | flat)
+        ids, rows, query_vals, idx_bottom, idx_top, val_bottom, val_top, binary_mode = (
+            a[keep] for a in (ids, rows, query_vals, idx_bottom, idx_top, val_bottom, val_top, binary_mode))
+        if not len(ids):
+            break
+
+        # Only the mixed strategy needs both guesses
+        if search_strategy != 'interpolation':
+            binary_guess = idx_bottom + (idx_top - idx_bottom) // 2
+        if search_strategy != 'binary':
+            span = idx_top - idx_bottom
+            if wide_dtype is object:
+                interpolation_guess = idx_bottom + (span * (query_vals - val_bottom)) // (val_top - val_bottom)
+            else:
+                # As in _search_loop - exact in int64 where the product fits, otherwise interpolated in floats
+                float_bottom = val_bottom.astype(np.float64)
+                float_denom = val_top.astype(np.float64) - float_bottom
+                exact = span * float_denom < _EXACT_PRODUCT_LIMIT
+                if exact.all():
+                    interpolation_guess = idx_bottom + (span * (query_vals - val_bottom)) // (val_top - val_bottom)
+                else:
+                    interpolation_guess = idx_bottom + (
+                        span * ((query_vals.astype(np.float64) - float_bottom) / float_denom)).astype(np.int64)
+                    interpolation_guess[exact] = idx_bottom[exact] + (
+                        (span[exact] * (query_vals[exact] - val_bottom[exact])) // (val_top[exact] - val_bottom[exact]))
+        if search_strategy == 'mixed':
+            idx_guess = np.where(binary_mode, binary_guess, interpolation_guess).astype(np.int64)
+        else:
+            idx_guess = (binary_guess if search_strategy == 'binary' else interpolation_guess).astype(np.int64)
+        interpolation_counts[ids] += ~binary_mode
+        binary_counts[ids] += binary_mode
+
+        val_guess = arrays[rows, idx_guess]
+        hit = val_guess == query_vals
+        found_idx[ids[hit]] = idx_guess[hit]
+
+        too_low = val_guess < query_vals
+        if search_strategy == 'mixed':
+            old_span = idx_top - idx_bottom + 1
+        idx_bottom = np.where(too_low, idx_guess + 1, idx_bottom)
+        idx_top = np.where(too_low, idx_top, idx_guess - 1)
+        if search_strategy == 'mixed':
+            # The same rules as ArraySearcher._set_search_mode()
+            array_elimination_fraction = (old_span - (idx_top - idx_bottom + 1)) / old_span
+            binary_mode = ((interpolation_counts[ids] >= max_interp_steps)
+                           | (~binary_mode & (array_elimination_fraction < interpolation_threshold)))
+        keep = ~hit
+        ids, rows, query_vals, idx_bottom, idx_top, binary_mode = (
+            a[keep] for a in (ids, rows, query_vals, idx_bottom, idx_top, binary_mode))
+
+    return found_idx, interpolation_counts + binary_counts, interpolation_counts, binary_counts
+
+
+# Integer codes for the search() strategies, as used by the compiled search loops
+_STRATEGY_CODES = {'mixed': 0, 'interpolation': 1, 'binary': 2, 'log-interpolation': 3}
+
+
+# Search modes used by _search_core, and the mode a mixed search moves to next, indexed by
+# [current mode][whether the last step eliminated less than interpolation_threshold of the search space]:
+# interpolation only hands over to binary after a poor step, and binary always hands back to interpolation
+_INTERPOLATION_MODE = 0
+_BINARY_MODE = 1
+_NEXT_MODE = ((_INTERPOLATION_MODE, _BINARY_MODE), (_INTERPOLATION_MODE, _INTERPOLATION_MODE))
+
+
+@njit(cache=True, inline='always')
+def _search_loop(array, query_val, interpolation_threshold, strategy, max_interp_steps, idx_bottom, idx_top,
+                 python_ints=False):
+    """The ArraySearcher.search() loop, compiled through _search_core.
+
+    Args:
+        array (np.ndarray): The sorted array.
+        query_val (int): The value to find.
+        interpolation_threshold (float): As for ArraySearcher.search().
+        strategy (int): The search strategy, as one of the _STRATEGY_CODES.
+        max_interp_steps (int): The number of interpolation steps a mixed search may take.
+        idx_bottom (int): The array index for the bottom of the initial search space.
+        idx_top (int): The array index for the top of the initial search space.
+        python_ints (bool, optional): Set when running the loop as plain Python on an array of Python ints, whose
+                                      products can't overflow, so every interpolation is exact. Defaults to False.
+
+    Returns:
+        tuple[int]: The index of query_val (-1 if it is not in the array), and the total, interpolation and
+                    binary step counts.
+    """
+    val_bottom = array[idx_bottom]
+    val_top = array[idx_top]
+    mode = int(strategy == 2)
+    interpolation_count = 0
+    binary_count = 0
+    while True:
+        if query_val < val_bottom or query_val > val_top:
+            return -1, interpolation_count + binary_count, interpolation_count, binary_count
+        if val_top == val_bottom:
+            return idx_bottom, interpolation_count + binary_count, interpolation_count, binary_count
+
+        if mode == _BINARY_MODE:
+            binary_count += 1
+            idx_guess = idx_bottom + (idx_top - idx_bottom) // 2
+        else:
+            interpolation_count += 1
+            span = idx_top - idx_bottom
+            # Python ints may be too large to convert to floats, so they skip the overflow check
+            if python_ints or span * (float(val_top) - float(val_bottom)) < _EXACT_PRODUCT_LIMIT:
+                idx_guess = idx_bottom + (span * (query_val - val_bottom)) // (val_top - val_bottom)
+            else:
+                # As in _interpolation_search_kernel - the exact product could overflow int64
+                float_denom = float(val_top) - float(val_bottom)
+                idx_guess = idx_bottom + int(span * ((float(query_val) - float(val_bottom)) / float_denom))
+        val_guess = array[idx_guess]
+        if val_guess == query_val:
+            return idx_guess, interpolation_count + binary_count, interpolation_count, binary_count
+
+        old_span = idx_top - idx_bottom + 1
+        if val_guess < query_val:
+            idx_bottom = idx_guess + 1
+            val_bottom = array[idx_bottom]
+        else:
+            idx_top = idx_guess - 1
+            val_top = array[idx_top]
+
+        if strategy == 0:
+            # The same rules as ArraySearcher._set_search_mode(), as a table lookup rather than a chain of
+            # data-dependent branches
+            array_elimination_fraction = (old_span - (idx_top - idx_bottom + 1)) / old_span
+            mode = max(_NEXT_MODE[mode][int(array_elimination_fraction < interpolation_threshold)],
+                       int(interpolation_count >= max_interp_steps))
+
+
+# Signatures _search_core is compiled for when the module is imported, one per storage dtype
+_CORE_SIGNATURES = [f'UniTuple(int64, 4)({np.dtype(dtype).name}[:], int64, float64, int64, int64, int64, int64)'
+                    for dtype in _INT_DTYPES]
+
+
+@njit(_CORE_SIGNATURES, cache=True)
+def _search_core(array, query_val, interpolation_threshold, strategy, max_interp_steps, idx_bottom, idx_top):
+    """Compiled version of the ArraySearcher.search() loop, with the same arguments and return values as
+    _search_loop.
+
+    The loop is inlined once per strategy with the strategy as a constant, so each copy is compiled without the
+    branches it never takes - a binary search never runs the interpolation divide or the mode switching.
+    """
+    if strategy == 0:
+        return _search_loop(array, query_val, interpolation_threshold, 0, max_interp_steps, idx_bottom, idx_top)
+    if strategy == 1:
+        return _search_loop(array, query_val, interpolation_threshold, 1, max_interp_steps, idx_bottom, idx_top)
+    return _search_loop(array, query_val, interpolation_threshold, 2, max_interp_steps, idx_bottom, idx_top)
+
+
+@njit(parallel=True, cache=True)
+def _search_core_many(array, keys, interpolation_threshold, strategy, max_interp_steps, out):
+    """Runs _search_core for every key, on chunks of keys on separate threads. Fills the columns of out with the
+    index of each key (or -1) and its total, interpolation and binary step counts."""
+    n_chunks = (keys.shape[0] + _PARALLEL_CHUNK - 1) // _PARALLEL_CHUNK
+    for chunk in prange(n_chunks):
+        for i in range(chunk * _PARALLEL_CHUNK, min((chunk + 1) * _PARALLEL_CHUNK, keys.shape[0])):
+            idx, search_count, interpolation_count, binary_count = _search_core(
+                array, keys[i], interpolation_threshold, strategy, max_interp_steps, 0, array.shape[0] - 1)
+            out[i, 0] = idx
+            out[i, 1] = search_count
+            out[i, 2] = interpolation_count
+            out[i, 3] = binary_count
+
+
+@njit(cache=True)
+def _log_search_core(array, log_array, query_val, log_query, idx_bottom, idx_top):
+    """Compiled version of the ArraySearcher.search() loop for the 'log-interpolation' strategy.
+
+    Guesses interpolate between the log_array values at the bounds, so values that grow geometrically are
+    guessed as well as evenly spread values are by plain interpolation.
+
+    Args:
+        array (np.ndarray): The sorted array.
+        log_array (np.ndarray): log(1 + array - array[0]) for every value, as floats.
+        query_val (int): The value to find.
+        log_query (float): log(1 + query_val - array[0]).
+        idx_bottom (int): The array index for the bottom of the initial search space.
+        idx_top (int): The array index for the top of the initial search space.
+
+    Returns:
+        tuple[int]: The index of query_val (-1 if it is not in the array), and the total, interpolation and
+                    binary step counts.
+    """
+    # The log values at the bounds are carried alongside the values, so each step only loads from the two
+    # arrays at the bound that moved
+    val_bottom = array[idx_bottom]
+    val_top = array[idx_top]
+    log_bottom = log_array[idx_bottom]
+    log_top = log_array[idx_top]
+    interpolation_count = 0
+    binary_count = 0
+    while True:
+        if query_val < val_bottom or query_val > val_top:
+            return -1, interpolation_count + binary_count, interpolation_count, binary_count
+        if val_top == val_bottom:
+            return idx_bottom, interpolation_count + binary_count, interpolation_count, binary_count
+
+        idx_guess = _log_idx_guess(log_bottom, log_top, log_query, idx_bottom, idx_top)
+        if idx_guess < 0:
+            # The bound values are too close to tell apart in log space
+            binary_count += 1
+            idx_guess = idx_bottom + (idx_top - idx_bottom) // 2
+        else:
+            interpolation_count += 1
+        val_guess = array[idx_guess]
+        if val_guess == query_val:
+            return idx_guess, interpolation_count + binary_count, interpolation_count, binary_count
+
+        if val_guess < query_val:
+            idx_bottom = idx_guess + 1
+            val_bottom = array[idx_bottom]
+            log_bottom = log_array[idx_bottom]
+        else:
+            idx_top = idx_guess - 1
+            val_top = array[idx_top]
+            log_top = log_array[idx_top]
+
+
+@njit(cache=True)
+def _log_idx_guess(log_bottom, log_top, log_query, idx_bottom, idx_top):
+    """Interpolates the index of log_query between idx_bottom and idx_top, whose log values are log_bottom and
+    log_top, or returns -1 if those are equal."""
+    log_span = log_top - log_bottom
+    if log_span <= 0:
+        return -1
+    idx_guess = idx_bottom + int((idx_top - idx_bottom) * ((log_query - log_bottom) / log_span))
+    # Rounding can put log_query a hair outside the bounds' log values
+    return min(max(idx_guess, idx_bottom), idx_top)
+
+
+def _interp_step_cap(length):
+    """Returns the number of interpolation steps a mixed search of an array of this length may take."""
+    return max(4, int(3 * math.log2(max(math.log2(length), 2))))
+
+
+# Arrays longer than this use a van Emde Boas layout rather than Eytzinger for batched lookups
+_VEB_CUTOFF = 2**26
+
+# Search step counts kept per searcher by compare_methods - the least used result is dropped beyond this
+_RESULTS_CACHE_SIZE = 500
+
+# The attributes search() sets for the last query, as saved with each compare_methods cache entry
+_SEARCH_ATTRIBUTES = ('query_val', 'search_strategy', 'interpolation_threshold', 'query_val_idx', 'search_count',
+                      'interpolation_count', 'binary_count')
 
 
 class ArraySearcher:
@@ -20,76 +711,188 @@ class ArraySearcher:
         search_count:            The total number of search steps taken.
         interpolation_count:     The number of search steps that employed an interpolation search strategy.
         binary_count:            The number of search steps that employed a binary search strategy.
+
+    After search_many() has been called with a search_strategy, the same counts are available per query.
+
+    Post-search_many attributes:
+        search_counts:           The total number of search steps taken for each query.
+        interpolation_counts:    The number of interpolation search steps taken for each query.
+        binary_counts:           The number of binary search steps taken for each query.
+
+    Array attributes:
+        gap_variation:           The standard deviation of the gaps between neighbouring values over their mean.
+        auto_strategy:           The search strategy used for search_strategy='auto' - 'interpolation' for evenly
+                                 spread values (gap_variation < 0.5), 'binary' for very uneven ones (> 2.0),
+                                 otherwise 'mixed'.
     """
-    def __init__(self, array):
+    def __init__(self, array, already_sorted=False):
         """Initialise the ArraySearcher instance.
 
         Args:
-            array (list): A list of integer values. This will get sorted.
+            array (list or np.ndarray): A sequence of integer values. This will get sorted.
+            already_sorted (bool, optional): Set if array is already in ascending order, so it isn't sorted again.
+                                             A contiguous NumPy array that is already of the storage dtype is
+                                             then used without copying, so it must not be modified afterwards.
+                                             Defaults to False.
+
+        Raises:
+            TypeError: If any value isn't an integer.
+            ValueError: If array is empty.
+        """
+        # int64 values, or Python ints for values too large for int64 (e.g. long geometric progressions)
+        values = _int_values(array)
+        if len(values) == 0:
+            raise ValueError('Cannot search an empty array.')
+        if values.dtype != object:
+            # Store in the narrowest integer type that fits, so more of the array stays in cache.
+            # The search loops interpolate in floats wherever the exact int64 product could overflow.
+            storage_dtype = _narrowest_int_dtype(values)
+        else:
+            # Otherwise the values are kept as Python ints
+            storage_dtype = object
+        # Unless it is already sorted this is a copy, which can be sorted in place without touching the caller's
+        # array. The compiled loops need a contiguous buffer, so a strided view is copied either way.
+        self.array = np.ascontiguousarray(values.astype(storage_dtype, copy=not already_sorted))
+        # Input that is already in order is common (e.g. progressions), and one vectorised comparison pass is far
+        # cheaper than sorting it again
+        if not already_sorted and not (self.array[1:] >= self.array[:-1]).all():
+            self.array.sort()
+        self._bot_val = self.array[0]
+        self._top_val = self.array[-1]
+        # Column widths for the verbose search output
+        self._idx_w = len(str(len(self.array) - 1))
+        self._val_w = max(len(str(self._bot_val)), len(str(self._top_val)))
+        # Interpolation steps allowed in a mixed search before it sticks to binary steps.
+        # Interpolation search needs about log2(log2(N)) steps on uniform data, so this is a generous cap
+        # that only bites on badly distributed arrays where interpolation degrades towards O(N).
+        self._max_interp_steps = _interp_step_cap(len(self.array))
+        # Arrays of Python ints can't be compiled, so they run the same search loop as plain Python.
+        # The Cython build of the loop is used when it has been built, as it needs no JIT warm-up.
+        if self.array.dtype == object:
+            self._search_core = functools.partial(_search_loop.py_func, python_ints=True)
+        elif _cython_search_core is not None:
+            self._search_core = _cython_search_core
+        else:
+            self._search_core = _search_core
+        # Interpolation search compiled for exactly this array's dtype and layout
+        self._kernel = _make_kernel(self.array.dtype)
+        # Index found by the last successful search, used as a starting point by search(start_from_last=True)
+        self._last_idx = None
+        # The log-interpolation loop, and the log values it interpolates between - built on first use
+        self._log_search_core = _log_search_core if self.array.dtype != object else _log_search_core.py_func
+        self._log_array = None
+        # Search functions compiled for this array by compile_search(), keyed by (strategy, threshold)
+        self._compiled_searches = {}
+        # Eytzinger / van Emde Boas copies of the array for batched lookups - built on first use
+        self._eytzinger = None
+        self._veb = None
+        # compare_methods search results (the _SEARCH_ATTRIBUTES values) keyed by (query_val, strategy, threshold),
+        # and how often each was used.
+        # The array is never modified after construction, so entries stay valid for the life of the searcher.
+        self._results_cache = {}
+        self._results_uses = {}
+        # Generator for get_random_array_item() - creating a new one per call costs far more than the draw
+        self._rng = np.random.default_rng()
+
+    @functools.cached_property
+    def gap_variation(self):
+        """Spread of the gaps between neighbouring values relative to their mean (0 for a true arithmetic
+        progression), worked out on first use.
+
+        Interpolation guesses are good when the gaps are even, and little better than blind when they vary wildly.
+        """
+        # Taken in floats, so the gaps of a narrow integer array can't wrap
+        try:
+            with np.errstate(over='ignore', invalid='ignore'):
+                gaps = np.diff(self.array.astype(np.float64))
+                gap_variation = float(gaps.std() / max(gaps.mean(), 1)) if len(gaps) else 0.0
+        except OverflowError:
+            return math.inf
+        if not math.isfinite(gap_variation):
+            # Values beyond the float range only come from exponentially growing arrays
+            return math.inf
+        return gap_variation
+
+    @functools.cached_property
+    def auto_strategy(self):
+        """The search strategy used for search_strategy='auto', chosen from gap_variation on first use."""
+        if self.gap_variation < 0.5:
+            return 'interpolation'
+        elif self.gap_variation > 2.0:
+            return 'binary'
+        return 'mixed'
+
+    @classmethod
+    def from_sorted(cls, array):
+        """Create an ArraySearcher for an array that is already in ascending order, without sorting or
+        (where possible) copying it. The same as ArraySearcher(array, already_sorted=True).
         """
-        self.array = sorted(array)
+        return cls(array, already_sorted=True)
 
     def _print_info(self, idx_top, idx_bottom, comment):
         """Prints info about the last search iteration."""
         print(' | '.join(
             [
                 f'Iteration: {self.search_count:>3}',
-                f'{comment:<20}',
+                # Wide enough for the longest label, 'Log-interpolation search'
+                f'{comment:<24}',
                 f'Query value: {self.query_val}',
-                f'Bottom index: {idx_bottom:>{len(str(idx_top))}}',
-                f'Top index: {idx_top:>{len(str(idx_top))}}',
-                f'Bottom value: {self.array[idx_bottom]:>{len(str(self.array[idx_top]))}}',
-                f'Top value: {self.array[idx_top]:>{len(str(self.array[idx_top]))}}'
+                f'Bottom index: {idx_bottom:>{self._idx_w}}',
+                f'Top index: {idx_top:>{self._idx_w}}',
+                f'Bottom value: {self.array[idx_bottom]:>{self._val_w}}',
+                f'Top value: {self.array[idx_top]:>{self._val_w}}'
             ]
         ))
 
-    def _calc_array_elimination(self, idx_guess, idx_top, idx_bottom, mode, verbose=False):
-        """Calculates the fraction of the array that can be removed.
-
-        Args:
-            idx_guess (int): The current guess for the index of query_val.
-            idx_top (int): The array index for the top of the current search space.
-            idx_bottom (int): The array index for the bottom of the current search space.
-            mode (str): 'low' if the idx_guess was too low.  'high' if the idx_guess was too high.
-
-        Returns:
-            float: The fraction of the current array search space that is removed by knowing idx_guess
-                   is too low or too high.
-        """
-        if mode == 'low':
-            array_elimination = (((idx_guess + 1) - idx_bottom) / ((idx_top + 1) - idx_bottom))
-        elif mode == 'high':
-            array_elimination = ((idx_top - (idx_guess - 1)) / ((idx_top + 1) - idx_bottom))
-
-        if verbose:
-            print(f'Index guess {idx_guess} value ({self.array[idx_guess]}) is too {mode}.')
-            print(f'Percentage of array eliminated: {array_elimination:.0%}')
-        return array_elimination
+    def _log_elimination(self, idx_guess, mode, array_elimination):
+        """Prints info about how much of the array the last guess eliminated."""
+        print(f'Index guess {idx_guess} value ({self.array[idx_guess]}) is too {mode}.')
+        print(f'Percentage of array eliminated: {array_elimination:.0%}')
 
-    def _idx_guess(self, idx_top, idx_bottom, search_mode, verbose=False):
-        """Guess the index of query_val.
+    def _idx_guess(self, idx_top, idx_bottom, val_bottom, val_span, search_mode):
+        """Guess the index of query_val, and print the search status.
 
         Args:
             idx_top (int): The array index for the top of the current search space.
             idx_bottom (int): The array index for the bottom of the current search space.
+            val_bottom (int): The array value at idx_bottom.
+            val_span (int): The difference between the array values at idx_top and idx_bottom.
             search_mode (str): 'interpolation' - an interpolation search strategy.
                                'binary' - a binary search strategy.
+                               'log-interpolation' - an interpolation search strategy on log values.
         """
+        if search_mode == 'log-interpolation':
+            log_array = self._get_log_array()
+            idx_guess = _log_idx_guess(log_array[idx_bottom], log_array[idx_top], self._log_query, idx_bottom, idx_top)
+            if idx_guess < 0:
+                # The bound values are too close to tell apart in log space
+                search_mode = 'binary'
+            else:
+                self.interpolation_count += 1
         if search_mode == 'interpolation':
             self.interpolation_count += 1
-            idx_guess = ((idx_top - idx_bottom) * (self.query_val - self.array[idx_bottom])) // (self.array[idx_top] - self.array[idx_bottom]) + idx_bottom
+            span = idx_top - idx_bottom
+            # The same guesses as _search_loop, which interpolates in floats where the int64 product could overflow
+            if self.array.dtype != object:
+                float_denom = float(val_bottom + val_span) - float(val_bottom)
+            if self.array.dtype == object or span * float_denom < _EXACT_PRODUCT_LIMIT:
+                idx_guess = (span * (int(self.query_val) - val_bottom)) // val_span + idx_bottom
+            else:
+                idx_guess = idx_bottom + int(span * ((float(self.query_val) - float(val_bottom)) / float_denom))
         elif search_mode == 'binary':
             self.binary_count += 1
             idx_guess = idx_bottom + (idx_top - idx_bottom) // 2
         self.search_count += 1
-        if verbose:
-            self._print_info(idx_top, idx_bottom, comment=f'{search_mode.capitalize()} search')
+        self._print_info(idx_top, idx_bottom, comment=f'{search_mode.capitalize()} search')
         return idx_guess
 
     def _set_search_mode(self, array_elimination_fraction, search_mode):
         """Method that checks and sets the search_mode based on simple rules."""
         # If we are running in mixed mode, make a decision about which search strategy to use next
-        if search_mode == 'binary':
+        if self.interpolation_count >= self._max_interp_steps:
+            # Interpolation has had its step budget - finish with binary search
+            return 'binary'
+        elif search_mode == 'binary':
             # If we ran a binary search, then always try interpolation next
             return 'interpolation'
         elif array_elimination_fraction < self.interpolation_threshold:
@@ -99,7 +902,35 @@ class ArraySearcher:
         else:
             return search_mode
 
-    def search(self, query_val, interpolation_threshold=0.25, search_strategy='mixed', verbose=False):
+    def _gallop_from_last(self, query_val):
+        """Brackets query_val by probing outwards from the last found index at distances 1, 2, 4, ...
+
+        Each probe is counted in search_count.
+
+        Returns:
+            tuple[int]: The bottom and top indices of a search space that holds query_val if it is in the array.
+                        Both are the index of query_val if a probe landed on it.
+        """
+        idx = self._last_idx
+        self.search_count += 1
+        if self.array[idx] == query_val:
+            return idx, idx
+        # query_val is within the array range, so a probe at the end of the array always brackets it
+        direction = 1 if self.array[idx] < query_val else -1
+        step = 1
+        while True:
+            probe = min(max(idx + direction * step, 0), len(self.array) - 1)
+            self.search_count += 1
+            if self.array[probe] == query_val:
+                return probe, probe
+            if (self.array[probe] > query_val) == (direction == 1):
+                # Passed query_val - it can only be between the last two probes
+                return (idx + 1, probe - 1) if direction == 1 else (probe + 1, idx - 1)
+            idx = probe
+            step *= 2
+
+    def search(self, query_val, interpolation_threshold=0.25, search_strategy='mixed', verbose=False,
+               start_from_last=False):
         """Search for the position of query_val in the array.
 
         Args:
@@ -112,13 +943,33 @@ class ArraySearcher:
                                                        remove enough search space.
                                      'interpolation' - exclusively run interpolation search steps.
                                             'binary' - exclusively run binary search steps.
+                                              'auto' - pick one of the above from how evenly the array values are
+                                                       spread (see ArraySearcher.auto_strategy).
+                                 'log-interpolation' - exclusively run interpolation search steps on the logs of
+                                                       the values (offset so the smallest is 1), which suits values
+                                                       that grow geometrically.
+            verbose (bool, optional): Print information about each search step. Defaults to False.
+            start_from_last (bool, optional): Before searching, gallop outwards from the index found by the previous
+                                              search (probing 1, 2, 4, ... positions away) until query_val is
+                                              bracketed, then search only that bracket. Queries close to the last
+                                              one then take O(log distance) steps rather than O(log N).
+                                              Each probe counts as a search step. Defaults to False, so that step
+                                              counts compare search strategies fairly.
 
         Raises:
+            TypeError: If query_val isn't an integer.
             ValueError: If query_val is outside of the range of the array.
 
         Returns:
-            int: The index of query_val
+            int: The index of query_val, or None if it is within the array range but not in the array.
         """
+        # Checked here, as the compiled loops would silently truncate a float
+        query_val = _exact_int(query_val)
+        if search_strategy == 'auto':
+            search_strategy = self.auto_strategy
+        # The strategy is compared as an int code from here on
+        strategy = _STRATEGY_CODES[search_strategy]
+
         # Initialise instance search attributes
         self.query_val = query_val
         self.search_strategy = search_strategy
@@ -133,55 +984,274 @@ class ArraySearcher:
         idx_bottom = 0
 
         # Raise an error if the query_val is outside of the array range
-        if not (query_val >= self.array[idx_bottom] and query_val <= self.array[idx_top]):
-            raise ValueError(f'The query value ({query_val}) is outside of the array range ({self.array[0] - self.array[-1]}).')
-
-        if verbose:
-            # Print the initial status
-            self._print_info(idx_top, idx_bottom, comment='Starting info')
+        if not (query_val >= self._bot_val and query_val <= self._top_val):
+            raise ValueError(f'The query value ({query_val}) is outside of the array range '
+                             f'({self._bot_val} - {self._top_val}).')
+
+        if start_from_last and self._last_idx is not None:
+            idx_bottom, idx_top = self._gallop_from_last(query_val)
+        probe_count = self.search_count
+
+        if strategy == _STRATEGY_CODES['log-interpolation']:
+            self._log_query = self._log_value(query_val)
+
+        if not verbose:
+            # Run a compiled loop - the Python loop below is only needed to print each step
+            if strategy == _STRATEGY_CODES['log-interpolation']:
+                query_val_idx, self.search_count, self.interpolation_count, self.binary_count = self._log_search_core(
+                    self.array, self._get_log_array(), query_val, self._log_query, idx_bottom, idx_top)
+            else:
+                query_val_idx, self.search_count, self.interpolation_count, self.binary_count = self._search_core(
+                    self.array, query_val, interpolation_threshold, strategy, self._max_interp_steps, idx_bottom,
+                    idx_top)
+            self.search_count += probe_count
+            if query_val_idx >= 0:
+                self.query_val_idx = self._last_idx = query_val_idx
+            return self.query_val_idx
+
+        # Print the initial status
+        self._print_info(idx_top, idx_bottom, comment='Starting info')
 
         # Search loop
-        if search_strategy in ['mixed', 'interpolation']:
-            search_mode = 'interpolation'
-        elif search_strategy == 'binary':
-            search_mode = 'binary'
-            interpolation_threshold = 1.0
+        search_mode = ('interpolation', 'interpolation', 'binary', 'log-interpolation')[strategy]
+
+        # Keep the values at the search space bounds in locals - they are only reloaded when a bound moves.
+        # They are held as Python ints, like the guessed value below, so the interpolation product can't overflow
+        # int64 and the loop never mixes NumPy scalar and Python int arithmetic.
+        val_top = int(self.array[idx_top])
+        val_bottom = int(self.array[idx_bottom])
+        val_span = val_top - val_bottom
 
         while self.query_val_idx is None:
 
+            # The bounds have closed in around a value that isn't in the array
+            if query_val < val_bottom or query_val > val_top:
+                break
+
             # This could be the case even before any search steps - so check before first guess
-            if self.array[idx_top] == self.array[idx_bottom]:
+            if val_span == 0:
                 self.query_val_idx = idx_bottom
                 break
 
             # Make a guess of the query_val index
-            idx_guess = self._idx_guess(idx_top, idx_bottom, search_mode)
+            idx_guess = self._idx_guess(idx_top, idx_bottom, val_bottom, val_span, search_mode)
+            val_guess = int(self.array[idx_guess])
 
             # If query_val is found at array index 'idx_guess'
-            if self.array[idx_guess] == query_val:
+            if val_guess == query_val:
                 self.query_val_idx = idx_guess
                 break
 
-            # If query_val is greater than the values at array index 'idx_guess'
-            elif self.array[idx_guess] < query_val:
-                array_elimination_fraction = self._calc_array_elimination(idx_guess, idx_top, idx_bottom, mode='low')
-                # Set the new lowest index for guessing to one above the index guess we just made
+            # Otherwise move one bound past idx_guess, as _search_loop does, reloading only the value at the bound
+            # that moved
+            old_span = idx_top - idx_bottom + 1
+            if val_guess < query_val:
                 idx_bottom = idx_guess + 1
-                if search_strategy == 'mixed':
-                    search_mode = self._set_search_mode(array_elimination_fraction, search_mode)
-
-            # If query_val is less than the values at array index 'idx_guess'
-            elif self.array[idx_guess] > query_val:
-                array_elimination_fraction = self._calc_array_elimination(idx_guess, idx_top, idx_bottom, mode='high')
-                # Set the new highest index for guessing to one below the index guess we just made
+                val_bottom = int(self.array[idx_bottom])
+                mode = 'low'
+            else:
                 idx_top = idx_guess - 1
-                if search_strategy == 'mixed':
-                    search_mode = self._set_search_mode(array_elimination_fraction, search_mode)
-
-        if verbose:
-            print(f'The query value ({query_val}) was found at index {idx_guess} (of the sorted array) after {self.search_count} iteration(s)')
+                val_top = int(self.array[idx_top])
+                mode = 'high'
+            val_span = val_top - val_bottom
+            # The fraction of the search space that was removed by this guess
+            array_elimination_fraction = (old_span - (idx_top - idx_bottom + 1)) / old_span
+            self._log_elimination(idx_guess, mode, array_elimination_fraction)
+            if strategy == 0:
+                search_mode = self._set_search_mode(array_elimination_fraction, search_mode)
+
+        if self.query_val_idx is not None:
+            self._last_idx = self.query_val_idx
+        if self.query_val_idx is None:
+            print(f'The query value ({query_val}) is not in the array (searched for {self.search_count} iteration(s))')
+        else:
+            print(f'The query value ({query_val}) was found at index {self.query_val_idx} (of the sorted array) '
+                  f'after {self.search_count} iteration(s)')
         return self.query_val_idx
 
+    def _get_eytzinger(self):
+        """Returns the Eytzinger-ordered copy of the array and its slot-to-index map, building them once."""
+        if self._eytzinger is None:
+            self._eytzinger = _build_eytzinger(self.array)
+        return self._eytzinger
+
+    def _get_log_array(self):
+        """Returns log(1 + array - array[0]) for the log-interpolation strategy as floats, building it once."""
+        if self._log_array is None:
+            if self.array.dtype == object:
+                # math.log takes Python ints of any size
+                self._log_array = np.array([math.log(val - self._bot_val + 1) for val in self.array])
+            else:
+                # The differences are non-negative and below 2**64, so they are exact in uint64 even where the int64
+                # subtraction wraps - the same conversion as _log_value()
+                differences = (self.array.astype(np.int64) - np.int64(self._bot_val)).view(np.uint64)
+                self._log_array = np.log1p(differences.astype(np.float64))
+        return self._log_array
+
+    def _log_value(self, val):
+        """Returns log(1 + val - array[0]), calculated the same way as the values in _get_log_array()."""
+        if self.array.dtype == object:
+            return math.log(val - self._bot_val + 1)
+        return float(np.log1p(np.float64(int(val) - int(self._bot_val))))
+
+    def _get_veb(self):
+        """Returns the van Emde Boas layout of the array and its navigation tables, building them once.
+
+        The layout is padded to a perfect tree, so it takes up to twice the memory of the array itself.
+        """
+        if self._veb is None:
+            tables = _veb_depth_tables(len(self.array).bit_length())
+            self._veb = (_build_veb(self.array, *tables), *tables)
+        return self._veb
+
+    def search_one(self, query_val):
+        """Find the position of query_val with an interpolation search specialised for this array.
+
+        Unlike search(), no search statistics are recorded and a value that is not in the array is
+        reported as -1 rather than raising an error.
+
+        Args:
+            query_val (int): An integer value to find in the array.
+
+        Raises:
+            TypeError: If query_val isn't an integer.
+
+        Returns:
+            int: The index of query_val in the sorted array, or -1 if it is not present.
+        """
+        query_val = _exact_int(query_val)
+        # Also keeps values beyond int64 away from the compiled kernel
+        if not self._bot_val <= query_val <= self._top_val:
+            return -1
+        return self._kernel(self.array, query_val)
+
+    def compile_search(self, search_strategy='interpolation', interpolation_threshold=0.25):
+        """Returns a search function compiled for this array, for workloads that search the same array many times.
+
+        The array, its bounds and the strategy are baked into the function as constants, so each call only passes
+        the query value and the compiler drops the paths the strategy never takes. Compiling takes a fraction of a
+        second, so this pays off over many thousands of searches. Functions are kept for the life of the searcher.
+
+        Args:
+            search_strategy (str, optional): 'mixed', 'interpolation', 'binary' or 'auto', as for search().
+                                             Defaults to 'interpolation'.
+            interpolation_threshold (float, optional): As for search(). Only used by the 'mixed' strategy.
+                                                       Defaults to 0.25.
+
+        Raises:
+            ValueError: If search_strategy is 'log-interpolation'.
+
+        Returns:
+            function: Takes an integer query value and returns its index in the sorted array, or -1 if it is
+                      not present.
+        """
+        if search_strategy == 'auto':
+            search_strategy = self.auto_strategy
+        if search_strategy == 'log-interpolation':
+            raise ValueError('The log-interpolation strategy is only available from search().')
+        key = (search_strategy, interpolation_threshold)
+        if key not in self._compiled_searches:
+            array = self.array
+            strategy = _STRATEGY_CODES[search_strategy]
+            max_interp_steps = self._max_interp_steps
+            idx_top = len(array) - 1
+            if array.dtype == object:
+                # Arrays of Python ints can't be compiled, so they get the same loop as plain Python
+                def search(query_val):
+                    return _search_loop.py_func(array, query_val, interpolation_threshold, strategy,
+                                                max_interp_steps, 0, idx_top, python_ints=True)[0]
+            else:
+                # Numba freezes the closure variables into the compiled function as constants
+                @njit
+                def search(query_val):
+                    return _search_loop(array, query_val, interpolation_threshold, strategy, max_interp_steps,
+                                        0, idx_top)[0]
+            self._compiled_searches[key] = search
+        return self._compiled_searches[key]
+
+    def search_many(self, keys, assume_sorted_keys=False, parallel=False, search_strategy=None,
+                    interpolation_threshold=0.25):
+        """Find the positions of many values in the array in one call.
+
+        Values that are not in the array are reported as -1 rather than raising an error. Search statistics
+        are only recorded when a search_strategy is given.
+
+        Args:
+            keys (list or np.ndarray): The integer values to find in the array.
+            assume_sorted_keys (bool, optional): Set if keys are in ascending order, so that each lookup starts
+                                                 from where the previous one finished. Otherwise the keys are
+                                                 looked up in a cache-friendly Eytzinger copy of the array,
+                                                 or a van Emde Boas copy for very large arrays.
+                                                 Defaults to False.
+            parallel (bool, optional): Interpolation search the keys on multiple threads. With a search_strategy,
+                                       run the compiled search() loop for each key on multiple threads instead.
+                                       Defaults to False.
+            search_strategy (str, optional): If given, run this search() strategy on all of the keys together in
+                                             vectorised NumPy passes, and record the step counts per key.
+                                             Defaults to None.
+            interpolation_threshold (float, optional): As for search(), when search_strategy is 'mixed'.
+                                                       Defaults to 0.25.
+
+        Raises:
+            TypeError: If any key isn't an integer.
+
+        Returns:
+            np.ndarray: The index of each key in the sorted array, or -1 where the key is not present.
+        """
+        # Keys stay int64 even when the array is stored narrower, so out of range keys can't wrap
+        keys = _int_values(keys)
+        if self.array.dtype == object:
+            keys = keys.astype(object)
+        elif keys.dtype == object:
+            # Keys beyond int64 can't be in an integer array - look up the rest and report those as missing
+            in_range = np.array([-2**63 <= key < 2**63 for key in keys], dtype=bool)
+            idx = np.full(len(keys), -1, dtype=np.int64)
+            idx[in_range] = self.search_many(keys[in_range].astype(np.int64), assume_sorted_keys=assume_sorted_keys,
+                                             parallel=parallel, search_strategy=search_strategy,
+                                             interpolation_threshold=interpolation_threshold)
+            if search_strategy is not None:
+                # The missing keys took no steps
+                all_counts = [np.zeros(len(keys), dtype=np.int64) for _ in range(3)]
+                for counts, in_range_counts in zip(all_counts, (self.search_counts, self.interpolation_counts,
+                                                                self.binary_counts)):
+                    counts[in_range] = in_range_counts
+                self.search_counts, self.interpolation_counts, self.binary_counts = all_counts
+            return idx
+        else:
+            keys = keys.astype(np.int64, copy=False)
+        if search_strategy == 'auto':
+            search_strategy = self.auto_strategy
+        if search_strategy == 'log-interpolation':
+            raise ValueError('The log-interpolation strategy is only available from search().')
+        if search_strategy is not None and parallel and self.array.dtype != object:
+            out = np.empty((len(keys), 4), dtype=np.int64)
+            # Always a float, so an int threshold doesn't compile a second specialisation of the parallel loop
+            _search_core_many(self.array, keys, float(interpolation_threshold), _STRATEGY_CODES[search_strategy],
+                              self._max_interp_steps, out)
+            self.search_counts, self.interpolation_counts, self.binary_counts = out[:, 1], out[:, 2], out[:, 3]
+            return out[:, 0]
+        if search_strategy is not None:
+            idx, self.search_counts, self.interpolation_counts, self.binary_counts = _lockstep_search(
+                self.array[np.newaxis], np.zeros(len(keys), dtype=np.int64), keys,
+                interpolation_threshold, search_strategy, self._max_interp_steps)
+            return idx
+        if self.array.dtype == object:
+            idx = np.searchsorted(self.array, keys, side='left')
+        elif parallel:
+            idx = np.empty(len(keys), dtype=np.int64)
+            _search_many_parallel(self.array, keys, idx)
+            return idx
+        elif assume_sorted_keys:
+            idx = _sorted_keys_search_kernel(self.array, keys)
+        elif len(self.array) > _VEB_CUTOFF:
+            idx = _veb_search_kernel(*self._get_veb(), len(self.array), keys)
+        else:
+            idx = _eytzinger_search_kernel(*self._get_eytzinger(), keys)
+        # The lookups give lower-bound positions - only keep those that land on the key itself
+        found = idx < len(self.array)
+        found[found] = self.array[idx[found]] == keys[found]
+        return np.where(found, idx, -1)
+
     def compare_methods(self, query_val, mixed_thresholds=None, verbose=False):
         """Runs interpolation, mixed, and binary search methods and returns a dictionary of method names against
         iteration count for finding the query_val in the array.
@@ -209,27 +1279,73 @@ class ArraySearcher:
                     strategy_name = f'{strategy}-{threshold}'
                 else:
                     strategy_name = strategy
-                self.search(query_val, **args_dict, verbose=verbose)
-                performance_dict[strategy_name] = self.search_count
+                performance_dict[strategy_name] = self._cached_search_count(query_val, args_dict, verbose)
 
             if verbose:
-                print(f'With {strategy_name} method it took {self.search_count} search step(s) to find the query value.')
+                print(f'With {strategy_name} method it took {performance_dict[strategy_name]} search step(s) to find '
+                      'the query value.')
         return performance_dict
 
-    def get_random_array_item(self):
+    def _cached_search_count(self, query_val, args_dict, verbose):
+        """Returns the search step count for query_val with the given search arguments, reusing earlier results.
+
+        A reused result also restores the search attributes, so they describe query_val as if search() had run.
+        """
+        key = (query_val, args_dict['search_strategy'], args_dict.get('interpolation_threshold'))
+        if key in self._results_cache and not verbose:
+            self._results_uses[key] += 1
+            for attribute, value in zip(_SEARCH_ATTRIBUTES, self._results_cache[key]):
+                setattr(self, attribute, value)
+            if self.query_val_idx is not None:
+                self._last_idx = self.query_val_idx
+            return self.search_count
+
+        self.search(query_val, **args_dict, verbose=verbose)
+        if key not in self._results_cache and len(self._results_cache) >= _RESULTS_CACHE_SIZE:
+            # Drop the least frequently used result
+            evicted = min(self._results_uses, key=self._results_uses.get)
+            del self._results_cache[evicted]
+            del self._results_uses[evicted]
+        self._results_cache[key] = tuple(getattr(self, attribute) for attribute in _SEARCH_ATTRIBUTES)
+        self._results_uses[key] = self._results_uses.get(key, 0) + 1
+        return self.search_count
+
+    def get_random_array_item(self, rng=None):
         """Chooses a random item from the array.
 
+        Args:
+            rng (np.random.Generator, optional): The random generator to draw from. If None, the searcher's own
+                                                 generator is used. Defaults to None.
+
         Returns:
             int: The random array item.
         """
-        return self.array[random.randrange(0, len(self.array))]
+        if rng is None:
+            rng = self._rng
+        return int(self.array[rng.integers(len(self.array))])
+
+    def get_random_array_items(self, n, rng=None):
+        """Chooses n random items from the array (with replacement), in one draw.
+
+        Args:
+            n (int): Number of items to choose.
+            rng (np.random.Generator, optional): The random generator to draw from. If None, the searcher's own
+                                                 generator is used. Defaults to None.
+
+        Returns:
+            np.ndarray: The random array items, in the array's dtype.
+        """
+        if rng is None:
+            rng = self._rng
+        return self.array[rng.integers(len(self.array), size=n)]
 
 
 def generate_random_array(cardinality,
                           space='arithmetic',
                           start_range=(1, 1000),
                           step_range=(1, 1000),
-                          sample_space_scale=None):
+                          sample_space_scale=None,
+                          rng=None):
     """Generate an array sampled from a random arithmetic or geometric progression.
 
     Args:
@@ -245,178 +1361,93 @@ def generate_random_array(cardinality,
                                                     If int, then this is how 'fold-bigger' the
                                                     sampled progression is vs the returned array.
                                                     Defaults to None.
+        rng (np.random.Generator, optional): The random generator to draw from. If None, a new
+                                             default generator is used. Defaults to None.
 
     Returns:
-        list[ints]: The array.
+        np.ndarray or list[ints]: The array - a list of Python ints if the progression grows beyond int64.
     """
-    start = random.randint(*start_range)
-    step = random.randint(*step_range)
+    if rng is None:
+        rng = np.random.default_rng()
+    # Python ints, so that geometric progressions can grow beyond int64
+    start = int(rng.integers(*start_range, endpoint=True))
+    step = int(rng.integers(*step_range, endpoint=True))
 
     if sample_space_scale is None:
         factor = 1
     else:
         factor = sample_space_scale
+    length = cardinality * factor
 
     if space == 'arithmetic':
-        series = [start + (i * step) for i in range(cardinality * factor)]
+        last = start + (length - 1) * step
+    elif space == 'geometric':
+        last = start * step**max(length - 1, 0)
+
+    if max(abs(start), abs(last)) < 2**63:
+        # The whole progression fits in int64, so build it in one pass
+        powers = np.arange(length, dtype=np.int64)
+        if space == 'arithmetic':
+            series = start + powers * step
+        elif space == 'geometric':
+            series = start * np.int64(step)**powers
+    elif space == 'arithmetic':
+        series = [start + (i * step) for i in range(length)]
     elif space == 'geometric':
-        series = [start * (step**i) for i in range(cardinality * factor)]
-    
+        series = [start * (step**i) for i in range(length)]
+
     if sample_space_scale is None:
         return series
-    else:
-        return [series[random.randrange(0, cardinality * factor)] for _ in range(cardinality)]
-
+    sample_idx = rng.integers(0, length, size=cardinality)
+    if isinstance(series, np.ndarray):
+        return series[sample_idx]
+    return [series[i] for i in sample_idx]
 
-def run_cardinality_tests(space='arithmetic', repeats=1000, top_power=10):
-    """Runs repeated tests on a series of doubling cardinality values.
-    
-    A new progression is generated for each repeat, and all 3 splitting methods are compared.
 
-    Args:
-        space (str, optional): Whether to test 'arithmetic' or 'geometric' progressions.
-                               Defaults to 'arithmetic'.
-        repeats (int, optional): Number of repeats. Defaults to 1000.
-        top_power (int, optional): Final value to use for the doubling progression (2**top_power).
+def _generate_progressions(n_arrays, cardinality, space='arithmetic', start_range=(1, 1000), step_range=(1, 1000),
+                           rng=None):
+    """Generate many random progressions at once, as for generate_random_array() with no sampling.
 
     Returns:
-        list[dicts]: A list of dictionaries of length 'repeats'.
-                     Keys are the method names, plus 'cardinality'.
-                     Values are the method absolute subset differences, plus cardinality
+        np.ndarray: A 2-D array with one ascending progression per row - int64 if every value fits, otherwise
+                    Python ints.
     """
-    testing_results = []
-    for cardinality in [2**n for n in range(top_power + 1)]:
-        for _ in tqdm(range(repeats)):
-            array = generate_random_array(cardinality=cardinality, space=space)
-            searcher = ArraySearcher(array)
-            query_val = searcher.get_random_array_item()
-            results = searcher.compare_methods(query_val)
-            results['cardinality'] = cardinality
-            testing_results.append(results)
+    if rng is None:
+        rng = np.random.default_rng()
+    starts = rng.integers(*start_range, size=n_arrays, endpoint=True)
+    steps = rng.integers(*step_range, size=n_arrays, endpoint=True)
+    if not n_arrays:
+        return np.empty((0, cardinality), dtype=np.int64)
+
+    # The largest value in any row, in Python ints
+    max_start, max_step = int(starts.max()), int(steps.max())
+    if space == 'arithmetic':
+        max_val = max_start + (cardinality - 1) * max_step
+    elif space == 'geometric':
+        max_val = max_start * max_step**max(cardinality - 1, 0)
 
-    return testing_results
+    powers = np.arange(cardinality, dtype=np.int64)
+    if max_val >= 2**63:
+        # Build the rows from Python ints so they can grow beyond int64
+        starts, steps, powers = starts.astype(object), steps.astype(object), powers.astype(object)
+    if space == 'arithmetic':
+        return starts[:, np.newaxis] + powers * steps[:, np.newaxis]
+    elif space == 'geometric':
+        return starts[:, np.newaxis] * steps[:, np.newaxis]**powers
 
 
-def plot_cardinality_tests(results, title=None, figsize=(12, 9), facecolor='white', confidence_interval=95):
-    """Generate a Seaborn plot of the results data.
+# The benchmarks and plots used to live in this module. Their old names still resolve, importing benchmarks
+# (and its pandas / plotting dependencies) on first use.
+_BENCHMARK_NAMES = ('run_cardinality_tests', 'plot_cardinality_tests', 'plot_progression_comparison', 'main')
 
-    Args:
-        results (list[dicts]): A list of results dictionaries - one dictionary per test run.
-        title (str, optional): The plot title. Defaults to None.
-        figsize (tuple, optional): The figure dimensions in inches. Defaults to (12, 9).
-        facecolor (str, optional): The figure background colour. Defaults to 'white'.
-        confidence_interval (int or str, optional): Confidence interval percent value to use in the plot.
-                                                    Alternatively, if 'sd' the standard deviation will be shown.
-                                                    Defaults to 95.
 
-    Returns:
-        matplotlib.figure.Figure: The figure.
-    """
-    # Make a dataframe from the list of dictionaries
-    testing_df = pd.DataFrame(results)
-    # Unpivot all columns not specified in the id_vars list
-    tall_df = pd.melt(testing_df, id_vars=['cardinality'], var_name='method', value_name='iterations')
-    # Make the plot
-    fig, ax = plt.subplots(figsize=figsize, facecolor=facecolor)
-    ax = sns.lineplot(data=tall_df, x='cardinality', y='iterations', hue='method', ci=confidence_interval)
-    ax.set_xlabel('progression cardinality')
-    ax.set_xscale('log', base=2)
-    ax.set_ylabel('mean number of iterations')
-    # Title
-    if title:
-        # Get repeats (just check the value for the first method/cardinality group)
-        repeats = tall_df.groupby(['method', 'cardinality']).agg('size')[0]
-        # Underscore assignment to supress Text object output
-        _ = ax.set_title(f'{title} ({repeats} repeats)')
-    return fig
-
-
-def plot_progression_comparison(arithmetic_results, geometric_results, cardinality, title=None, figsize=(12, 9), facecolor='white'):
-    # Make a dataframe from the list of dictionaries
-    arithmetic_df = pd.DataFrame(arithmetic_results)
-    arithmetic_df['space'] = ['arithmetic' for _ in range(len(arithmetic_df))]
-    geometric_df = pd.DataFrame(geometric_results)
-    geometric_df['space'] = ['geometric' for _ in range(len(geometric_df))]
-    space_testing_df = pd.concat([arithmetic_df, geometric_df])
-    space_testing_df = space_testing_df[space_testing_df.cardinality == cardinality]
-    # Unpivot all columns not specified in the id_vars list
-    tall_df = pd.melt(space_testing_df, id_vars=['space', 'cardinality'], var_name='method', value_name='iterations')
-    # Make the plot
-    fig, ax = plt.subplots(figsize=figsize, facecolor=facecolor)
-    ax = sns.barplot(data=tall_df, x='space', y='iterations', hue='method')
-    ax.set_xlabel('array space')
-    ax.set_yscale('log', base=10)
-    ax.set_ylabel('log(mean number of iterations)')
-    # Title
-    if title:
-        # Underscore assignment to supress Text object output
-        _ = ax.set_title(f'{title} (cardinality {cardinality})')
-    return fig
-
-def main():
-    # SETUP
-    # Pandas and seaborn options
-    pd.set_option('display.max_rows', 10)
-    sns.set_context('talk') 
-    # Make sure we have a folder to write results to
-    import os
-    if not os.path.isdir('results'):
-        os.mkdir('results')
-
-
-    # WALKTHROUGH EXAMPLE
-    # Input parameters
-    CARDINALITY = 50
-    SPACE = 'arithmetic'
-    START_RANGE = (1, 10000)
-    STEP_RANGE = (1, 10000)
-    # Generate a random progression
-    array = generate_random_array(cardinality=CARDINALITY, space=SPACE, start_range=START_RANGE, step_range=STEP_RANGE)
-    print(array)
-    # Make a searcher object
-    searcher = ArraySearcher(array)
-    query_val = searcher.get_random_array_item()
-    print(query_val)
-    # Compare the different search methods
-    results = searcher.compare_methods(query_val, verbose=True)
-    print(results)
-
-
-    # ARITHMETIC SERIS TESTS
-    # Run tests for arithmetic series of cardinalities 2**0 - 2**10 (1000 repeats)
-    REPEATS = 1000
-    SPACE = 'arithmetic'
-    TOP_POWER = 10
-    arithmetic_results = run_cardinality_tests(space=SPACE, repeats=REPEATS, top_power=TOP_POWER)
-    # Export results as CSV
-    arithmetic_df = pd.DataFrame(arithmetic_results)
-    arithmetic_df.to_csv('results/arithmetic_results.csv')
-    # Make seaborn plot
-    fig = plot_cardinality_tests(arithmetic_results, title='Arithmetic comparison')
-    fig.savefig('results/arithmetic_comparison.png')
-
-
-    # GEOMETRIC SERIS TESTS
-    # Run tests for geometric series of cardinalities 2**0 - 2**10 (1000 repeats)
-    SPACE = 'geometric'
-    geometric_results = run_cardinality_tests(space=SPACE, repeats=REPEATS, top_power=TOP_POWER)
-    # Export results as CSV
-    geometric_df = pd.DataFrame(geometric_results)
-    geometric_df.to_csv('results/geometric_results.csv')
-    # Make seaborn plot
-    fig = plot_cardinality_tests(geometric_results, title='Arithmetic comparison')
-    fig.savefig('results/geometric_comparison.png')
-
-
-    # COMPARE ARITHMETIC AND GEOMETRIC PERFORMANCE
-    # Input parameters
-    CARDINALITY = 1024
-    # Make seaborn plot
-    fig = plot_progression_comparison(arithmetic_results=arithmetic_results,
-                                      geometric_results=geometric_results,
-                                      cardinality=CARDINALITY,
-                                      title='Comparison of arithmetic vs geometric progressions')
-    fig.savefig('results/progression_space_comparison.png')
+def __getattr__(name):
+    if name in _BENCHMARK_NAMES:
+        import benchmarks
+        return getattr(benchmarks, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 if __name__ == '__main__':
-    main()
+    import benchmarks
+    benchmarks.main()
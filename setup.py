@@ -0,0 +1,11 @@
+"""Builds the optional Cython search kernel in place: python setup.py build_ext --inplace"""
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name='interpolation-search',
+    ext_modules=cythonize(
+        [Extension('_search', ['_search.pyx'], extra_compile_args=['-O3', '-march=native'])],
+        compiler_directives={'language_level': 3},
+    ),
+)
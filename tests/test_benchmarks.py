@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import benchmarks
+from interpolation_search import ArraySearcher, _generate_progressions
+
+
+def test_run_cardinality_tests_workers():
+    # Each block draws from its own child generator, so the results don't depend on how the blocks are run
+    results = [benchmarks.run_cardinality_tests(repeats=300, top_power=5, rng=np.random.default_rng(0),
+                                                workers=workers)
+               for workers in (1, 2)]
+    pd.testing.assert_frame_equal(*results)
+
+
+@pytest.mark.parametrize('space, cardinality', [('arithmetic', 1024), ('geometric', 64)])
+def test_cardinality_test_counts(space, cardinality):
+    repeats = 20
+    counts = benchmarks._cardinality_test_counts(cardinality, repeats, space, np.random.default_rng(1))
+    assert counts.shape == (len(benchmarks._TEST_STRATEGIES), repeats)
+
+    # The same progressions and queries, searched one at a time
+    rng = np.random.default_rng(1)
+    arrays = _generate_progressions(repeats, cardinality, space=space, rng=rng)
+    query_idx = rng.integers(cardinality, size=repeats)
+    for i, (array, query_val) in enumerate(zip(arrays, arrays[np.arange(repeats), query_idx])):
+        search_counts = ArraySearcher.from_sorted(array).compare_methods(query_val)
+        assert [search_counts[strategy] for strategy in benchmarks._TEST_STRATEGIES] == counts[:, i].tolist()
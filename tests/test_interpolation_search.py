@@ -0,0 +1,345 @@
+import numpy as np
+import pytest
+
+import interpolation_search
+from interpolation_search import ArraySearcher
+
+
+def _spread_values(low, high, n=300, seed=0):
+    """n distinct sorted Python ints, unevenly spread between low and high (inclusive)."""
+    rng = np.random.default_rng(seed)
+    values = {low, high}
+    while len(values) < n:
+        values.update(int(v) for v in rng.integers(low, high, size=n, endpoint=True))
+    return sorted(values)[:n - 1] + [high]
+
+
+# Sorted distinct values that are stored in each dtype. The int16 values span more than int16 can hold as a
+# difference, the int64 values span too much for the interpolation product to fit in int64, and the object values
+# are beyond int64.
+STORAGE_VALUES = {
+    'int16': _spread_values(-30000, 30000),
+    'int32': _spread_values(-2 * 10**9, 2 * 10**9),
+    'int64': _spread_values(-2**63, 2**63 - 1),
+    'object': [2**70 + v for v in _spread_values(0, 10**12)],
+}
+
+
+def _searchers(dtype):
+    """A searcher built from a shuffled list, and one from a strided view of a sorted array of the storage dtype."""
+    values = STORAGE_VALUES[dtype]
+    shuffled = list(np.random.default_rng(1).permutation(np.array(values, dtype=object)))
+    strided = np.repeat(np.array(values, dtype=dtype), 2)[::2]
+    assert not strided.flags['C_CONTIGUOUS']
+    return [ArraySearcher(shuffled), ArraySearcher.from_sorted(strided)]
+
+
+def _queries(dtype):
+    """Every value with its expected index, and values missing from the array (inside its range) with -1."""
+    values = STORAGE_VALUES[dtype]
+    present = set(values)
+    missing = [v + 1 for v in values[:-1] if v + 1 not in present][:50]
+    return values + missing, list(range(len(values))) + [-1] * len(missing)
+
+
+@pytest.mark.parametrize('search_strategy', ['interpolation', 'mixed', 'binary'])
+def test_search_many_narrow_dtype(search_strategy):
+    # Value differences in this int16 array don't fit in int16, so the interpolation must widen them
+    searcher = ArraySearcher([-30000, -29000, 0, 1, 2, 100, 29000, 30000])
+    assert searcher.array.dtype == np.int16
+    keys = list(searcher.array) + [5, -29999, 29999]
+    idx = searcher.search_many(keys, search_strategy=search_strategy)
+    assert idx.tolist() == list(range(len(searcher.array))) + [-1, -1, -1]
+
+
+def test_from_sorted_strided_view():
+    # A strided view is stored as a contiguous copy, as the compiled loops need
+    searcher = ArraySearcher.from_sorted(np.arange(0, 60000, dtype=np.int32)[::2])
+    assert searcher.array.flags['C_CONTIGUOUS']
+    searcher.search(400)
+    assert searcher.query_val_idx == 200
+    assert searcher.search_one(400) == 200
+
+
+def test_from_sorted_contiguous_is_not_copied():
+    array = np.arange(0, 60000, dtype=np.int32)
+    assert np.shares_memory(ArraySearcher.from_sorted(array).array, array)
+
+
+def test_compare_methods_cache_restores_search_attributes():
+    searcher = ArraySearcher(np.arange(0, 3000, 3))
+    first = searcher.compare_methods(300)
+    searcher.compare_methods(2991)
+    # Served from the cache, but the attributes must describe this query rather than the previous one
+    assert searcher.compare_methods(300) == first
+    assert searcher.query_val == 300
+    assert searcher.query_val_idx == 100
+    assert searcher.search_strategy == 'binary'
+    assert searcher.search_count == first['binary']
+    assert searcher.interpolation_count + searcher.binary_count == searcher.search_count
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+def test_storage_dtype(dtype):
+    for searcher in _searchers(dtype):
+        assert searcher.array.dtype == dtype
+        assert searcher.array.flags['C_CONTIGUOUS']
+        assert searcher.array.tolist() == STORAGE_VALUES[dtype]
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+@pytest.mark.parametrize('search_strategy', ['mixed', 'interpolation', 'binary', 'log-interpolation', 'auto'])
+def test_search(dtype, search_strategy):
+    queries, expected = _queries(dtype)
+    for searcher in _searchers(dtype):
+        for query_val, idx in zip(queries, expected):
+            searcher.search(query_val, search_strategy=search_strategy)
+            assert searcher.query_val_idx == (idx if idx >= 0 else None), query_val
+            assert searcher.search_count == searcher.interpolation_count + searcher.binary_count
+
+
+# Repeating patterns of gaps, with gap_variation just either side of the 0.5 and 2.0 thresholds
+@pytest.mark.parametrize('gaps, auto_strategy', [
+    ([7], 'interpolation'),
+    ([1, 3, 3], 'interpolation'),  # 0.40
+    ([1, 1, 3], 'mixed'),  # 0.56
+    ([1] * 6 + [30], 'mixed'),  # 1.97
+    ([1] * 6 + [40], 'binary'),  # 2.07
+])
+def test_auto_strategy(gaps, auto_strategy):
+    searcher = ArraySearcher(np.cumsum(gaps * 20))
+    # Both are only worked out when they are first needed
+    assert 'gap_variation' not in vars(searcher) and 'auto_strategy' not in vars(searcher)
+    searcher.search(int(searcher.array[5]), search_strategy='auto')
+    assert searcher.query_val_idx == 5
+    assert 'gap_variation' in vars(searcher)
+    assert searcher.auto_strategy == auto_strategy
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+@pytest.mark.parametrize('search_strategy', ['mixed', 'interpolation', 'binary'])
+def test_search_verbose(dtype, search_strategy, capsys):
+    queries, expected = _queries(dtype)
+    searcher = _searchers(dtype)[0]
+    for query_val, idx in list(zip(queries, expected))[::25]:
+        searcher.search(query_val, search_strategy=search_strategy, verbose=True)
+        quiet_counts = (searcher.search_count, searcher.interpolation_count, searcher.binary_count)
+        assert searcher.query_val_idx == (idx if idx >= 0 else None), query_val
+        # The traced loop takes the same steps as the compiled one
+        searcher.search(query_val, search_strategy=search_strategy)
+        assert (searcher.search_count, searcher.interpolation_count, searcher.binary_count) == quiet_counts
+    capsys.readouterr()
+
+
+def _gallop_probe_count(values, last_idx, query_val):
+    """The number of probes search(start_from_last=True) should make - the last index, then the indices 1, 3, 7,
+    15, ... away from it (clamped to the array) until one reaches or passes query_val."""
+    if values[last_idx] == query_val:
+        return 1
+    direction = 1 if values[last_idx] < query_val else -1
+    k = 1
+    while True:
+        probe = min(max(last_idx + direction * (2**k - 1), 0), len(values) - 1)
+        if direction * (values[probe] - query_val) >= 0:
+            return k + 1
+        k += 1
+
+
+# Last indices at both ends of the array and in the middle. The probes from either end are clamped to the other
+# end before they pass the far values.
+@pytest.mark.parametrize('last_idx', [0, 1, 150, 298, 299])
+@pytest.mark.parametrize('search_strategy', ['mixed', 'interpolation', 'binary', 'log-interpolation'])
+def test_search_start_from_last(last_idx, search_strategy):
+    queries, expected = _queries('int32')
+    values = STORAGE_VALUES['int32']
+    searcher = ArraySearcher(values)
+    for query_val, idx in zip(queries, expected):
+        searcher.search(values[last_idx])
+        searcher.search(query_val, search_strategy=search_strategy, start_from_last=True)
+        assert searcher.query_val_idx == (idx if idx >= 0 else None), query_val
+        # search_count includes the probes, and the interpolation and binary counts don't
+        probe_count = searcher.search_count - searcher.interpolation_count - searcher.binary_count
+        assert probe_count == _gallop_probe_count(values, last_idx, query_val)
+        if idx == last_idx:
+            assert searcher.search_count == 1
+        # A missing value leaves the last index where it was
+        assert searcher._last_idx == (idx if idx >= 0 else last_idx)
+
+
+def test_search_start_from_last_before_any_search():
+    searcher = ArraySearcher(STORAGE_VALUES['int32'])
+    searcher.search(STORAGE_VALUES['int32'][10], start_from_last=True)
+    assert searcher.query_val_idx == 10
+    assert searcher.search_count == searcher.interpolation_count + searcher.binary_count
+
+
+@pytest.mark.parametrize('search_strategy', ['mixed', 'log-interpolation'])
+def test_search_verbose_columns(search_strategy, capsys):
+    searcher = ArraySearcher(STORAGE_VALUES['int32'])
+    searcher.search(STORAGE_VALUES['int32'][123], search_strategy=search_strategy, verbose=True)
+    rows = [line for line in capsys.readouterr().out.splitlines() if line.startswith('Iteration')]
+    # Every step label fits its column, so the columns after it line up
+    assert len(rows) > 1
+    assert len({row.index('| Query value') for row in rows}) == 1
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+def test_search_one(dtype):
+    queries, expected = _queries(dtype)
+    for searcher in _searchers(dtype):
+        assert [searcher.search_one(query_val) for query_val in queries] == expected
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+@pytest.mark.parametrize('search_strategy', [None, 'mixed', 'interpolation', 'binary', 'auto'])
+@pytest.mark.parametrize('parallel', [False, True])
+def test_search_many(dtype, search_strategy, parallel):
+    queries, expected = _queries(dtype)
+    for searcher in _searchers(dtype):
+        idx = searcher.search_many(queries, parallel=parallel, search_strategy=search_strategy)
+        assert idx.tolist() == expected
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+@pytest.mark.parametrize('search_strategy', ['mixed', 'interpolation', 'binary'])
+@pytest.mark.parametrize('parallel', [False, True])
+def test_search_many_step_counts(dtype, search_strategy, parallel):
+    # The batch loops take the same steps as search()
+    queries, _ = _queries(dtype)
+    searcher = _searchers(dtype)[0]
+    searcher.search_many(queries, parallel=parallel, search_strategy=search_strategy)
+    counts = list(zip(searcher.search_counts.tolist(), searcher.interpolation_counts.tolist(),
+                      searcher.binary_counts.tolist()))
+    for query_val, query_counts in zip(queries, counts):
+        searcher.search(query_val, search_strategy=search_strategy)
+        assert (searcher.search_count, searcher.interpolation_count, searcher.binary_count) == query_counts
+
+
+def test_wide_int64_values_are_not_stored_as_objects():
+    # Values that fit in int64 stay int64 however far apart they are
+    values = np.arange(0, 10**15, 10**10)
+    searcher = ArraySearcher(values)
+    assert searcher.array.dtype == np.int64
+    assert searcher.search_many(values[::7], search_strategy='interpolation').tolist() == list(range(0, 10**5, 7))
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+def test_search_many_sorted_keys(dtype):
+    queries, expected = _queries(dtype)
+    order = np.argsort(np.array(queries, dtype=object), kind='stable')
+    for searcher in _searchers(dtype):
+        idx = searcher.search_many([queries[i] for i in order], assume_sorted_keys=True)
+        assert idx.tolist() == [expected[i] for i in order]
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+def test_search_many_veb(dtype, monkeypatch):
+    monkeypatch.setattr(interpolation_search, '_VEB_CUTOFF', 0)
+    queries, expected = _queries(dtype)
+    for searcher in _searchers(dtype):
+        assert searcher.search_many(queries).tolist() == expected
+
+
+@pytest.mark.parametrize('dtype', list(STORAGE_VALUES))
+@pytest.mark.parametrize('search_strategy', ['mixed', 'interpolation', 'binary'])
+def test_compile_search(dtype, search_strategy):
+    queries, expected = _queries(dtype)
+    for searcher in _searchers(dtype):
+        search = searcher.compile_search(search_strategy)
+        assert [search(query_val) for query_val in queries] == expected
+
+
+def _kernel_array(dtype):
+    """The storage values of an integer dtype with runs of duplicates - long enough for the 8-way steps of
+    _binary_search_kernel - and keys to look up in it."""
+    values = STORAGE_VALUES[dtype]
+    array = np.repeat(np.array(values, dtype=dtype), np.random.default_rng(2).integers(1, 4, size=len(values)))
+    keys, _ = _queries(dtype)
+    keys = keys + [key for key in (values[0] - 1, values[-1] + 1) if -2**63 <= key < 2**63]
+    return array, keys
+
+
+@pytest.mark.parametrize('dtype', ['int16', 'int32', 'int64'])
+@pytest.mark.parametrize('as_list', [False, True])
+def test_binary_search(dtype, as_list):
+    array, keys = _kernel_array(dtype)
+    assert len(array) >= interpolation_search._NARY_THRESHOLD
+    lower_bounds = np.searchsorted(array.astype(np.int64), keys)
+    for key, lower_bound in zip(keys, lower_bounds):
+        # Duplicates give the first index of the key
+        expected = lower_bound if key in array else -1
+        assert interpolation_search.binary_search(array.tolist() if as_list else array, key) == expected, key
+
+
+@pytest.mark.parametrize('dtype', ['int16', 'int32', 'int64'])
+@pytest.mark.parametrize('as_list', [False, True])
+@pytest.mark.parametrize('cython', [False, True])
+def test_interpolation_search(dtype, as_list, cython, monkeypatch):
+    if not cython:
+        monkeypatch.setattr(interpolation_search, '_cython_interp_search', None)
+    elif interpolation_search._cython_interp_search is None:
+        pytest.skip('The Cython extension is not built')
+    array, keys = _kernel_array(dtype)
+    for key in keys:
+        idx = interpolation_search.interpolation_search(array.tolist() if as_list else array, key)
+        # Duplicates can give any index of the key
+        if key in array:
+            assert array[idx] == key, key
+        else:
+            assert idx == -1, key
+
+
+@pytest.mark.parametrize('array', [
+    np.array([1, 2**63 + 5], dtype=np.uint64),
+    [1, 2**63 + 5],
+    [-1, 2**63 + 5],
+    np.array([1.0, 2.0**70]),
+])
+def test_values_beyond_int64_are_kept_exactly(array):
+    searcher = ArraySearcher(array)
+    assert searcher.array.dtype == object
+    assert searcher.array.tolist() == sorted(int(val) for val in array)
+    assert searcher.search_many(searcher.array.tolist()).tolist() == [0, 1]
+
+
+@pytest.mark.parametrize('array', [np.array([3.0, 1.0]), np.array([5, 1], dtype=np.uint8), [True, 3]])
+def test_other_integer_inputs(array):
+    searcher = ArraySearcher(array)
+    assert searcher.array.dtype == np.int16
+    assert searcher.array.tolist() == sorted(int(val) for val in array)
+
+
+@pytest.mark.parametrize('array', [np.array([1.5, 2.0]), [1, 2.5], ['a']])
+def test_non_integer_values_raise(array):
+    with pytest.raises(TypeError):
+        ArraySearcher(array)
+
+
+def test_empty_array_raises():
+    with pytest.raises(ValueError):
+        ArraySearcher([])
+
+
+def test_kernel_functions_reject_values_beyond_int64():
+    with pytest.raises(OverflowError):
+        interpolation_search.binary_search(np.array([1, 2**63 + 5], dtype=np.uint64), 1)
+
+
+def test_non_integer_queries_raise():
+    searcher = ArraySearcher([1, 2, 3])
+    with pytest.raises(TypeError):
+        searcher.search(2.5)
+    with pytest.raises(TypeError):
+        searcher.search_one(2.5)
+    with pytest.raises(TypeError):
+        searcher.search_many([2.5])
+
+
+@pytest.mark.parametrize('search_strategy', [None, 'mixed'])
+def test_search_many_keys_beyond_int64(search_strategy):
+    searcher = ArraySearcher([1, 2, 3])
+    idx = searcher.search_many([2**70, 2, -2**70, np.uint64(2**64 - 1)], search_strategy=search_strategy)
+    assert idx.tolist() == [-1, 1, -1, -1]
+    if search_strategy is not None:
+        assert searcher.search_counts.tolist()[::2] == [0, 0]
+    assert searcher.search_one(2**70) == -1